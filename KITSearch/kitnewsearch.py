@@ -1,16 +1,25 @@
 #pylint: disable=C0103
 """KITNewSearch module"""
 import sys
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 import yaml
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import timeit
 
 class KITNewSearch(object):
     """Module for searching data in ETP Measurement DB.    """
-    def __init__(self, cred=None, meas_key="measurement_keys.yml"):
+    def __init__(self, cred=None, meas_key="measurement_keys.yml", timeout=30,
+                 retries=2, backoff=0.5, pool_size=10):
         """
         cred (dict or path): {"url": "...", "token": "..."}
+        timeout (float): seconds to wait for the server before giving up
+        retries (int): number of additional attempts if a request fails
+        backoff (float): backoff factor for the delay between retries
+        pool_size (int): number of keep-alive connections to the server
         """
         self.log = logging.getLogger(__class__.__name__)
         self.log.setLevel(logging.DEBUG)
@@ -24,6 +33,10 @@ class KITNewSearch(object):
         self.url = None
         self.token = None
         self.connection = False
+        self.timeout = timeout
+        self.pool_size = pool_size
+        # shared by all requests so that worker threads reuse connections
+        self.session = self.__init_session(retries, backoff, pool_size)
         if cred is not None:
             if isinstance(cred, str):
                 with open(cred, "r") as crx:
@@ -34,25 +47,75 @@ class KITNewSearch(object):
             self.meas_key = yaml.load(stream, Loader=yaml.FullLoader)
 
 
+    @staticmethod
+    def __init_session(retries, backoff, pool_size):
+        """Create a session with a pool of keep-alive connections. Failed
+        connections and temporary server errors are retried with an
+        exponential backoff."""
+        retry = Retry(total=retries, backoff_factor=backoff,
+                      status_forcelist=(500, 502, 503, 504),
+                      allowed_methods=("HEAD", "GET"))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                              max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
     def set_credentials(self, cred):
         try:
             self.url = cred["url"]
             self.token = {"Authorization":  "Token {}".format(cred["token"])}
         except Exception:
             raise Exception("Couldn't load credentials from credentials file.")
+        self.session.headers.update(self.token)
 
     def check_connection(self):
-        data = requests.get("http://{!s}/measurements/".format(self.url),
-                 headers=self.token)
-        if data.status_code == 200:
+        """Check if the server is reachable and accepts the token. Only the
+        headers of the measurement listing are requested, not the listing
+        itself."""
+        url = "http://{!s}/measurements/".format(self.url)
+        try:
+            response = self.session.head(url, timeout=self.timeout)
+            if response.status_code == 405:
+                # HEAD not supported: stop after the headers were received
+                with self.session.get(url, timeout=self.timeout,
+                                      stream=True) as response:
+                    pass
+        except requests.RequestException as err:
+            self.log.error(err)
+            return False
+        if response.status_code == 200:
             return True
         else:
             return False
 
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
 
     def search_pid(self, pid):
-        data = requests.get("http://{!s}/measurement/{!s}/json".format(self.url, pid),
-                 headers=self.token).json()
+        """Fetch the measurement of a single PID. Failed requests are repeated
+        by the session's retry adapter before the error is raised."""
+        response = self.session.get(
+            "http://{!s}/measurement/{!s}/json".format(self.url, pid),
+            timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def search_pids(self, pid_lst, workers=None):
+        """Fetch the measurements of several PIDs concurrently. At most
+        'workers' requests are running at the same time (None uses one worker
+        per pooled connection of the session). The returned list has the same
+        order as 'pid_lst'."""
+        if workers is None:
+            workers = self.pool_size
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            data = list(executor.map(self.search_pid, pid_lst))
+        self.log.info("Fetched %i measurement(s) in %.3f s", len(pid_lst),
+                      time.perf_counter() - start)
         return data
 
     def extract_data(self, data):
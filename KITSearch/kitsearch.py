@@ -3,9 +3,28 @@
 # import sys
 # import os
 import logging
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+import numpy as np
 import yaml
 import sqlalchemy
+from sqlalchemy import select, func, and_
+from sqlalchemy.engine import URL
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+try:
+    # columnar cursors and connection pool of the bundled mysql-connector
+    # (Utils/)
+    from mysql.connector.cursor import MySQLCursorNumPy
+    from mysql.connector.cursor import MySQLCursorPreparedNumPy
+    from mysql.connector.pooling import MySQLConnectionPool
+    from mysql.connector.errors import Error as MySQLError
+except ImportError:
+    MySQLCursorNumPy = None
+    MySQLCursorPreparedNumPy = None
+    MySQLConnectionPool = None
+    MySQLError = None
 try:
     from db_map import db_info, db_probe, db_probe_data
     from db_map import db_alibava, db_annealing, db_irradiation
@@ -13,6 +32,19 @@ except ImportError:
     from .db_map import db_info, db_probe, db_probe_data
     from .db_map import db_alibava, db_annealing, db_irradiation
 
+# keys of the probe data dict and their columns in db_probe_data
+PROBE_DATA_COLUMNS = OrderedDict([("dataX", "datax"),
+                                  ("dataY", "datay"),
+                                  ("dataZ", "dataz"),
+                                  ("temp", "temperature"),
+                                  ("rh", "RH"),
+                                  ("err", "errory"),
+                                  ("time", "time"),
+                                  ("bias_cur", "bias_current")])
+
+# maximum number of PIDs in a single 'probeid IN (...)' query
+IN_BATCH = 500
+
 class KITSearch(object):
     """Module for searching data in ETP Measurement DB.
     Primary keys:
@@ -23,15 +55,57 @@ class KITSearch(object):
         - db_irradiation : uirrad_id
         - db_annealing : annealing_id
     """
-    def __init__(self, cred=None):
-        """Initializes class, loads credentials, creates engine and DB session,
-        creates dict for calling table objects with name.
+    # engines shared by all instances, keyed by URL and pool options
+    engines = {}
+    # connection pools of the bundled mysql-connector behind shared engines
+    pools = {}
+    engine_lock = threading.Lock()
+
+    def __init__(self, cred=None, pool_size=5, max_overflow=10,
+                 pool_recycle=3600, pool_pre_ping=True, prepared=True,
+                 compress=False, buffered=None, max_allowed_packet=None,
+                 connect_timeout=None, shared_pool=False,
+                 pool_reset_session=False, pool_timeout=30):
+        """Initializes class, loads credentials, gets the shared engine for
+        these credentials, creates DB session, creates dict for calling table
+        objects with name.
+
+        Args:
+            pool_size (int): number of connections kept open by the engine
+            max_overflow (int): number of additional connections at peak load
+            pool_recycle (int): reconnect connections older than this many
+                seconds (MySQL drops idle connections after 'wait_timeout')
+            pool_pre_ping (bool): test connections on checkout
+            prepared (bool): run measurement data lookups as server side
+                prepared statements with binary results (bundled
+                mysql-connector only, see 'fetch_columns')
+            compress (bool): use the compressed MySQL protocol, which pays
+                off on slow connections (e.g. VPN)
+            buffered (bool): fetch complete results right after a query is
+                executed (SQLAlchemy default: True)
+            max_allowed_packet (int): largest packet in bytes the client
+                sends and announces to the server (bundled mysql-connector
+                only, default: 1 GB)
+            connect_timeout (int): seconds until connecting to the server and
+                waiting for its replies is given up
+            shared_pool (bool): run on a MySQLConnectionPool of the bundled
+                mysql-connector instead of SQLAlchemy's pool. It opens
+                'pool_size' connections right away, which are shared by all
+                instances with these credentials, and checks them with a
+                ping on checkout ('max_overflow', 'pool_recycle' and
+                'pool_pre_ping' are not used).
+            pool_reset_session (bool): clear the session state (and prepared
+                statements) when a connection goes back to the shared pool.
+                This costs a round trip (a re-authentication on MySQL
+                < 5.7.3) on every checkin and empties the statement cache.
+            pool_timeout (int): seconds to wait for a free connection
 
         Misc:
                 cred = {"host"      : "...",
                         "database"  : "...",
                         "user"      : "...",
-                        "passwd"    : "..."}
+                        "passwd"    : "...",
+                        "port"      : 3306}     (optional)
         """
         self.log = logging.getLogger(__class__.__name__)
         self.log.setLevel(logging.DEBUG)
@@ -44,13 +118,39 @@ class KITSearch(object):
 
         if isinstance(cred, str):
             with open(cred, "r") as crx:
-                dic = yaml.load(crx)
+                dic = yaml.load(crx, Loader=yaml.FullLoader)
             cred = list(dic.values())[0]
 
-        self.engine = sqlalchemy.create_engine("mysql+mysqlconnector://" +
-                                               cred["user"] + ":" + cred["passwd"] +
-                                               "@" + cred["host"] + ":" +
-                                               "3306" + "/" + cred["database"])
+        url = URL.create("mysql+mysqlconnector",
+                         username=cred["user"],
+                         password=cred["passwd"],
+                         host=cred["host"],
+                         port=int(cred.get("port", 3306)),
+                         database=cred["database"])
+        connect_args = {"compress": compress}
+        if buffered is not None:
+            connect_args["buffered"] = buffered
+        if max_allowed_packet is not None:
+            connect_args["max_allowed_packet"] = int(max_allowed_packet)
+        if connect_timeout is not None:
+            connect_args["connect_timeout"] = int(connect_timeout)
+        self.prepared = prepared
+        if shared_pool is True and MySQLConnectionPool is None:
+            self.log.warning("Shared connection pool needs the bundled "
+                             "mysql-connector, using SQLAlchemy's pool")
+            shared_pool = False
+        if shared_pool is True:
+            self.engine = KITSearch.get_pooled_engine(
+                url, pool_size=pool_size,
+                pool_reset_session=pool_reset_session,
+                pool_timeout=pool_timeout, connect_args=connect_args)
+        else:
+            self.engine = KITSearch.get_engine(url, pool_size=pool_size,
+                                               max_overflow=max_overflow,
+                                               pool_recycle=pool_recycle,
+                                               pool_pre_ping=pool_pre_ping,
+                                               pool_timeout=pool_timeout,
+                                               connect_args=connect_args)
 
         session = sessionmaker(bind=self.engine)
         self.session = session()
@@ -62,6 +162,92 @@ class KITSearch(object):
                          "db_annealing" : db_annealing,
                          "db_irradiation" : db_irradiation}
 
+    @classmethod
+    def get_engine(cls, url, **pool_options):
+        """Returns the process wide engine for this URL and pool options and
+        creates it if it doesn't exist yet"""
+        key = cls.__engine_key(url, pool_options)
+        with cls.engine_lock:
+            if key not in cls.engines:
+                cls.engines[key] = sqlalchemy.create_engine(url, **pool_options)
+            return cls.engines[key]
+
+    @classmethod
+    def get_pooled_engine(cls, url, pool_size=5, pool_reset_session=False,
+                          pool_timeout=30, connect_args=None):
+        """Returns the process wide engine running on a MySQLConnectionPool
+        of the bundled mysql-connector and creates both if they don't exist
+        yet. The pool opens all of its connections when it is created, so
+        checking one out later doesn't need a handshake with the server."""
+        connect_args = connect_args or {}
+        key = cls.__engine_key(url, {"shared_pool": True,
+                                     "pool_size": pool_size,
+                                     "pool_reset_session": pool_reset_session,
+                                     "pool_timeout": pool_timeout,
+                                     "connect_args": connect_args})
+        with cls.engine_lock:
+            if key not in cls.engines:
+                pool = MySQLConnectionPool(
+                    pool_name="KITSearch_{}".format(len(cls.engines)),
+                    pool_size=pool_size,
+                    pool_reset_session=pool_reset_session,
+                    host=url.host, port=url.port, user=url.username,
+                    password=url.password, database=url.database,
+                    **connect_args)
+                cls.pools[key] = pool
+                cls.engines[key] = sqlalchemy.create_engine(
+                    url, poolclass=NullPool,
+                    creator=lambda: pool.get_connection(pool_timeout))
+            return cls.engines[key]
+
+    @classmethod
+    def dispose_engines(cls):
+        """Closes all pooled connections of all shared engines"""
+        with cls.engine_lock:
+            for engine in cls.engines.values():
+                engine.dispose()
+            for pool in cls.pools.values():
+                # take every idle connection out of the pool and close it
+                while True:
+                    try:
+                        cnx = pool.get_connection()
+                    except MySQLError:
+                        break
+                    cnx.disconnect()
+            cls.engines.clear()
+            cls.pools.clear()
+
+    @staticmethod
+    def __engine_key(url, pool_options):
+        return (url.render_as_string(hide_password=False),
+                tuple(sorted((name, tuple(sorted(val.items())))
+                             if isinstance(val, dict) else (name, val)
+                             for name, val in pool_options.items())))
+
+    @contextmanager
+    def batch(self):
+        """Context manager for a batch of lookups. The session's connection
+        is returned to the pool when the batch is done.
+
+            with search.batch():
+                data = search.probe_search_data(pid)
+        """
+        try:
+            yield self
+        finally:
+            self.session.close()
+
+    def close(self):
+        """Returns the session's connection to the pool. The shared engine
+        stays alive for other instances (see 'dispose_engines')."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
     def search_table(self, table, **kwargs):
         """Basic search operation: search for key-value DB table. You can add
         '%' in a kwarg for a wildcard search. One wildcard allowed at a time."""
@@ -99,83 +285,230 @@ class KITSearch(object):
 
     def probe_search(self, name, project, pid_list=None):
         """Combined search operation: searche data for specific name
-        and project"""
+        and project. Wildcards ('%') are allowed as in 'search_table'. All
+        matching measurements and their meta information are collected with
+        one joined query, their data with batched 'probeid IN (...)'
+        queries."""
+        info = db_info.__table__
+        probe = db_probe.__table__
+        query = self.__probe_meta_query()\
+            .where(wildcard(info.c.name, name),
+                   wildcard(info.c.project, project))\
+            .order_by(probe.c.probeid)
+        if pid_list is not None:
+            query = query.where(probe.c.probeid.in_(pid_list))
+        rows = self.session.execute(query).all()
+        particles = self.particle_types([row.probeid for row in rows])
+        meta_lst = [probe_meta(row, particles[row.probeid]) for row in rows]
+
+        data = self.probe_search_data_bulk([meta["PID"] for meta in meta_lst])
         dic = {}
-        PID = []
-        ID = []
-        for row in self.search_table("db_info", name=name, project=project):
-            ID.append(row.ID)
-        if ID == []:
-            return dic
-        for item in ID:
-            for row in self.search_table("db_probe", ID=item):
-                if pid_list is None:
-                    PID.append(row.probeid)
-                elif row.probeid in pid_list:
-                    PID.append(row.probeid)
-            for run in PID:
-                sub = self.probe_search_data(run)
-                pid = sub.pop("PID")
-                sub["PID"] = pid
-                sub["ID"] = item
-                # fluence, pt = self.get_fluence(item, sub["date"])
-                # sub.update({"fluence" : fluence,
-                #             "particletype"  : pt})
-
-                dic.update({pid : sub})
+        for meta in meta_lst:
+            sub = data[meta["PID"]]
+            sub.update(meta)
+            dic.update({meta["PID"] : sub})
         return dic
 
-    def probe_search_data(self, pid):
-        """Searches measurement data of given probeid"""
-        dic = {}
-        dataX = []
-        dataY = []
-        dataZ = []
-        temp = []
-        rh = []
-        err = []
-        time = []
-        bias_cur = []
-
-        for row in self.search_table("db_probe_data", probeid=pid):
-            dataX.append(row.datax)
-            dataY.append(row.datay)
-            dataZ.append(row.dataz)
-            temp.append(row.temperature)
-            rh.append(row.RH)
-            err.append(row.errory)
-            time.append(row.time)
-            bias_cur.append(row.bias_current)
-
-        dic.update({"dataX"     : dataX,
-                    "dataY"     : dataY,
-                    "dataZ"     : dataZ,
-                    "temp"      : temp,
-                    "rh"        : rh,
-                    "err"       : err,
-                    "time"      : time,
-                    "bias_cur"  : bias_cur})
-
-        for row in self.search_table("db_probe", probeid=pid):
-            dic.update({"paraX"     : row.paraX,
-                        "paraY"     : row.paraY,
-                        "t0"        : row.temperature,
-                        "h0"        : row.RH,
-                        "PID"       : row.probeid,
-                        "ID"        : row.ID,
-                        "date"      : row.date,
-                        "flag"      : row.flag})
-
-        for row in self.search_table("db_info", ID=dic["ID"]):
-            dic.update({"name"      : row.name,
-                        "project"   : row.project})
+    def probe_search_data_bulk(self, pid_lst):
+        """Searches measurement data of several probeids. The rows of up to
+        'IN_BATCH' PIDs are fetched at once and split up into the single
+        measurements in numpy.
 
-        fluence, pt = self.get_fluence(dic["ID"], dic["date"])
-        dic.update({"annealing"     : self.get_annealing(dic["ID"], dic["date"])})
-        dic.update({"fluence"       : fluence,
-                    "particletype"  : pt})
+        Returns:
+            dict: {pid : dict with one array per data column}
+        """
+        data = db_probe_data.__table__
+        dic = {pid : to_arrays([], PROBE_DATA_COLUMNS) for pid in pid_lst}
+        for i in range(0, len(pid_lst), IN_BATCH):
+            columns = self.fetch_columns(
+                select(data.c.probeid,
+                       *[data.c[col] for col in PROBE_DATA_COLUMNS.values()])
+                .where(data.c.probeid.in_(pid_lst[i:i+IN_BATCH]))
+                .order_by(data.c.probeid, data.c.probe_uid),
+                ["probeid"] + list(PROBE_DATA_COLUMNS))
+            pids = columns.pop("probeid").astype(np.int64)
+            if pids.size == 0:
+                continue
+            # rows are sorted by probeid: split where a new probeid starts.
+            # The parts are copied, views would keep the whole batch alive.
+            uniq, starts = np.unique(pids, return_index=True)
+            splitted = {key : np.split(val, starts[1:])
+                        for key, val in columns.items()}
+            for j, pid in enumerate(uniq.tolist()):
+                dic[pid] = {key : val[j].copy()
+                            for key, val in splitted.items()}
         return dic
 
+    def probe_search_data(self, pid, chunksize=None):
+        """Searches measurement data of given probeid. The data columns are
+        fetched with a single Core select as numpy arrays (see
+        'fetch_columns'). Meta information, annealing and fluence are
+        fetched with one joined query.
+
+        Args:
+            chunksize (None|int): read the data in chunks of this many rows
+                (see 'probe_search_data_iter') in order to limit the memory
+                footprint of long measurements
+        """
+        if chunksize is None:
+            dic = self.fetch_columns(self.__probe_data_query(pid),
+                                     PROBE_DATA_COLUMNS)
+        else:
+            dic = collect_chunks(self.probe_search_data_iter(pid, chunksize),
+                                 PROBE_DATA_COLUMNS)
+
+        row = self.session.execute(
+            self.__probe_meta_query().where(
+                db_probe.__table__.c.probeid == pid)).first()
+        if row is None:
+            raise ValueError("Couldn't find PID {} in db_probe".format(pid))
+        dic.update(probe_meta(row, self.particle_types([pid])[pid]))
+        return dic
+
+    def particle_types(self, pid_lst):
+        """Searches the particle types of all irradiation steps before the
+        measurement date of several probeids in the order of the
+        irradiation table. The rows of up to 'IN_BATCH' PIDs are fetched at
+        once.
+
+        Returns:
+            dict: {pid : list of particle types}
+        """
+        probe = db_probe.__table__
+        irr = db_irradiation.__table__
+        dic = {pid : [] for pid in pid_lst}
+        for i in range(0, len(pid_lst), IN_BATCH):
+            query = select(probe.c.probeid, irr.c.particletype)\
+                .select_from(probe.join(
+                    irr, and_(irr.c.ID == probe.c.ID,
+                              irr.c.date < func.date(probe.c.date))))\
+                .where(probe.c.probeid.in_(pid_lst[i:i+IN_BATCH]))\
+                .order_by(probe.c.probeid, irr.c.uirrad_id)
+            for row in self.session.execute(query):
+                dic[row.probeid].append(row.particletype)
+        return dic
+
+    def probe_search_data_iter(self, pid, chunksize=10000):
+        """Generator that yields the measurement data of given probeid in
+        chunks of at most 'chunksize' rows, e.g. for long term measurements
+        with millions of rows. Meta information is not included.
+
+        Yields:
+            dict: {key of PROBE_DATA_COLUMNS : array}
+        """
+        return self.iter_columns(self.__probe_data_query(pid),
+                                 PROBE_DATA_COLUMNS, chunksize)
+
+    @staticmethod
+    def __probe_data_query(pid):
+        """Select statement for the data columns of a probe station
+        measurement"""
+        data = db_probe_data.__table__
+        return select(*[data.c[col] for col in PROBE_DATA_COLUMNS.values()])\
+            .where(data.c.probeid == pid)\
+            .order_by(data.c.probe_uid)
+
+    def fetch_columns(self, query, columns):
+        """Runs a Core select and returns its result as one numpy array per
+        column. On a connection of the bundled mysql-connector the result
+        set is decoded by its columnar cursor straight into arrays, without
+        a Python object per row and value. If 'prepared' is set, the select
+        runs as a server side prepared statement that is kept in the
+        connection's statement cache, so repeated lookups of the same kind
+        (e.g. 'probeid = ?') are neither sent nor parsed again and numbers
+        arrive in binary form. Other drivers fall back to fetching rows and
+        'to_arrays'.
+
+        Args:
+            query: select statement
+            columns (list): keys for the selected columns (in order)
+
+        Returns:
+            dict: {key : array}, see 'to_arrays' for the array types
+        """
+        cursor = self.__columnar_cursor(query)
+        if cursor is None:
+            return to_arrays(self.session.execute(query).all(), columns)
+        try:
+            arrays = list(cursor.fetch_columns().values())
+        finally:
+            cursor.close()
+        return {key : typed_column(key, val)
+                for key, val in zip(columns, arrays)}
+
+    def iter_columns(self, query, columns, chunksize=10000):
+        """Generator version of 'fetch_columns'. The result is read from the
+        server in chunks of at most 'chunksize' rows and each chunk is
+        yielded as soon as it is decoded, so only one chunk of the result
+        set is held in memory at a time. Other drivers stream the rows
+        with 'stream_results'.
+
+        Yields:
+            dict: {key : array} for every chunk
+        """
+        cursor = self.__columnar_cursor(query)
+        if cursor is None:
+            result = self.session.execute(
+                query.execution_options(stream_results=True,
+                                        yield_per=chunksize))
+            for rows in result.partitions(chunksize):
+                yield to_arrays(rows, columns)
+            return
+        chunks = cursor.iter_columns(chunksize)
+        try:
+            for chunk in chunks:
+                yield {key : typed_column(key, val)
+                       for key, val in zip(columns, chunk.values())}
+        finally:
+            # discards unread chunks if the caller stopped early
+            chunks.close()
+            cursor.close()
+
+    def __columnar_cursor(self, query):
+        """Executes a select with the (prepared) columnar cursor of the
+        bundled mysql-connector.
+
+        Returns:
+            cursor with an unread result or None if the session runs on
+            another driver
+        """
+        dbapi = self.session.connection().connection.dbapi_connection
+        if MySQLCursorNumPy is None or not hasattr(dbapi, "get_columns"):
+            return None
+        compiled = query.compile(dialect=self.engine.dialect,
+                                 compile_kwargs={"render_postcompile": True})
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+        if self.prepared is True and MySQLCursorPreparedNumPy is not None:
+            cursor = dbapi.cursor(cursor_class=MySQLCursorPreparedNumPy)
+        else:
+            cursor = dbapi.cursor(cursor_class=MySQLCursorNumPy)
+        cursor.execute(str(compiled), params)
+        return cursor
+
+    @staticmethod
+    def __probe_meta_query():
+        """Select statement for the meta information of probe station
+        measurements. Annealing and fluence are summed up over all annealing
+        and irradiation steps before the measurement date in correlated
+        subqueries, so that everything comes in a single round trip."""
+        probe = db_probe.__table__
+        info = db_info.__table__
+        ann = db_annealing.__table__
+        irr = db_irradiation.__table__
+        annealing = select(func.coalesce(func.sum(ann.c.equiv), 0))\
+            .where(ann.c.ID == probe.c.ID, ann.c.date < probe.c.date)\
+            .scalar_subquery()
+        irradiated = (irr.c.ID == probe.c.ID,
+                      irr.c.date < func.date(probe.c.date))
+        fluence = select(func.coalesce(func.sum(irr.c.F_n_cm2), 0))\
+            .where(*irradiated).scalar_subquery()
+        return select(probe.c.paraX, probe.c.paraY, probe.c.temperature,
+                      probe.c.RH, probe.c.probeid, probe.c.ID, probe.c.date,
+                      probe.c.flag, info.c.name, info.c.project,
+                      annealing.label("annealing"),
+                      fluence.label("fluence"))\
+            .select_from(probe.outerjoin(info, probe.c.ID == info.c.ID))
+
     def ali_search_for_run(self, run):
         """Combined search operation: search for run data according to given
         run number"""
@@ -303,6 +636,89 @@ class KITSearch(object):
         return self.session
 
 
+def wildcard(column, val):
+    """Filter condition for a table column that treats '%' in the same way
+    as 'search_table' does"""
+    if isinstance(val, str) and val != "" and val[-1] == "%":
+        return column.contains(val.replace("%", ""))
+    if isinstance(val, str) and "%" in val:
+        first, second = val.split("%")[:2]
+        return and_(column.contains(first), column.contains(second))
+    return column == val
+
+
+def to_arrays(rows, columns):
+    """Converts a list of result rows into one numpy array per column.
+    Numeric columns become float64 arrays (NULL -> nan), the 'time' column
+    a datetime64 array."""
+    if rows == []:
+        values = [()] * len(columns)
+    else:
+        values = list(zip(*rows))
+    return {key : typed_column(key, val) for key, val in zip(columns, values)}
+
+
+def collect_chunks(chunks, columns):
+    """Appends the chunks of a chunked result (see 'iter_columns') to one
+    array per column. The arrays are grown in place with doubling capacity
+    and trimmed in the end, so only one chunk is alive at a time and the
+    data isn't copied into a second full-size array.
+
+    Returns:
+        dict: {key : array}
+    """
+    arrays = None
+    size = 0
+    for chunk in chunks:
+        n = len(chunk[next(iter(columns))])
+        if arrays is None:
+            arrays = {key : np.empty(max(n, 1), dtype=chunk[key].dtype)
+                      for key in columns}
+        capacity = len(arrays[next(iter(columns))])
+        if size + n > capacity:
+            capacity = max(2 * capacity, size + n)
+            for arr in arrays.values():
+                arr.resize(capacity, refcheck=False)
+        for key in columns:
+            arrays[key][size:size + n] = chunk[key]
+        size += n
+        # release the chunk before the next one is decoded
+        del chunk
+    if arrays is None:
+        return to_arrays([], columns)
+    for arr in arrays.values():
+        arr.resize(size, refcheck=False)
+    return arrays
+
+
+def typed_column(key, values):
+    """Converts the values of one column into the array type used for this
+    column: datetime64 for 'time', float64 (NULL -> nan) otherwise"""
+    if key == "time":
+        return np.asarray(values, dtype="datetime64[us]")
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        return values.astype(np.float64, copy=False)
+    return np.array(list(values), dtype=np.float64)
+
+
+def probe_meta(row, particletype):
+    """Converts a result row of the probe meta query and the particle types
+    of the measurement into the meta part of the probe data dict"""
+    return {"paraX"         : row.paraX,
+            "paraY"         : row.paraY,
+            "t0"            : row.temperature,
+            "h0"            : row.RH,
+            "PID"           : row.probeid,
+            "ID"            : row.ID,
+            "date"          : row.date,
+            "flag"          : row.flag,
+            "name"          : row.name,
+            "project"       : row.project,
+            "annealing"     : round(row.annealing),
+            "fluence"       : row.fluence,
+            "particletype"  : particletype}
+
+
 if __name__ == '__main__':
 
 
@@ -35,6 +35,30 @@ PARSER.add_argument("-old", "--old_db",
                     help="Search in new DB",
                     action="store_true",
                     default=False)
+PARSER.add_argument("-w", "--workers",
+                    help="Number of workers that load files of a folder in "
+                         "parallel",
+                    type=int,
+                    default=None)
+PARSER.add_argument("-p", "--pool",
+                    help="Use a 'thread' or 'process' pool for loading files "
+                         "in parallel",
+                    choices=["thread", "process"],
+                    default="thread")
+PARSER.add_argument("-ca", "--cache",
+                    help="Keep database measurements in a local cache and "
+                         "reuse them instead of fetching them again",
+                    action="store_true")
+PARSER.add_argument("-cd", "--cache_dir",
+                    help="Folder of the local cache for database measurements",
+                    default=None)
+PARSER.add_argument("-rf", "--refresh",
+                    help="Fetch measurements from the database again and "
+                         "refresh the local cache",
+                    action="store_true")
+PARSER.add_argument("-hl", "--headless",
+                    help="Only save the plot without showing it",
+                    action="store_true")
 
 
 KWARGS = vars(PARSER.parse_args())
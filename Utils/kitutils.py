@@ -112,87 +112,167 @@ def adjustOrder(List, entryDict, len_total):
 
 
 def manipulate(graphList, arg, cv_norm):
-    msg = ""
-    if cv_norm is True:
-        graphList, msg = normalize(graphList, "CV")
-
-    if arg == 'off':
-        pass
-    elif isinstance(arg, OrderedDict):
-        for val in arg.values():
-            val = extractList(val)
-            graphList, text = normalize(graphList, val)
-            if msg == "":
-                msg = text
-            else:
-                msg = msg + ", " + text
-    else:
-        graphList, msg = normalize(graphList, arg)
-    return graphList, msg
-
-
-def normalize(graphList, arg):
-    facList = []
-    # normalization for CV plots
-    if arg in ["1/C^{2}", "CV"]:
-        for i, graph in enumerate(graphList):
-            try:
-                tempList = []
-                for val in graph[1]:
-                    if val == 0:
-                        tempList.append(0)
-                    else:
-                        tempList.append(1/(val*val))
-                graph[1] = tempList
-            except:
-                if graph[1] == 0:
-                    pass
-                else:
-                    graph[1] = 1/(graph[1]*graph[1])
-        msg = "Manipulated y-values by inverting their square"
-
-    # normalization via list of factors
-    elif isinstance(arg, list):
-        for fac in arg:
-            facList.append(fac)
-        if len(graphList) != len(facList):
-            raise ValueError("Invalid normalization input! Number of "
-                             "factors differs from the number of graphs.")
-        for i, graph in enumerate(graphList):
-            tempList = []
-            try:
-                for val in graph[1]:
-                    tempList.append(val/float(facList[i]))
-                graph[1] = tempList
-            except:
-                graph[1] = graph[1]/float(facList[i])
-        msg = "Normalized y-values by given denominators"
-
-    # normalization via single factor
-    elif isinstance(arg, (float, int)):
-        for i, graph in enumerate(graphList):
-            tempList = []
-            try:
-                for val in graph[1]:
-                    tempList.append(val/arg)
-                graph[1] = tempList
-            except:
-                graph[1] = graph[1]/arg
-        msg = "Normalized y-values by given denominator {}".format(arg)
-
-    elif "--x" in arg:
-        fac = float(arg.split(" ")[1])
-        for graph in graphList:
-            temp_lst = []
-            for val in graph[0]:
-                temp_lst.append(val/fac)
-            graph[0] = temp_lst
-        msg = "Normalized x-values by given denominator {}".format(arg)
+    """ Applies the 1/C^2 transformation of CV plots ('cv_norm') followed by
+        the options of 'Misc/Normalization' ('arg') to the graphs. 'arg' can
+        be "off", a single option or an OrderedDict with several options
+        that are applied in order.
 
+        Returns:
+            list of new graphs and a message that describes what was done
+    """
+    options = []
+    if cv_norm is True:
+        options.append("CV")
+    if isinstance(arg, OrderedDict):
+        options.extend(extractList(val) for val in arg.values())
+    elif arg != 'off':
+        options.append(arg)
+    return normalize(graphList, *options)
+
+
+def normalize(graphList, *args):
+    """ Normalizes the graphs by every option in 'args':
+            "CV"/"1/C^{2}": y -> 1/y^2 (0 stays 0)
+            factor: y -> y/factor
+            list of factors: y -> y/factor for each graph respectively
+            "--x factor": x -> x/factor
+        The options are first folded into one numerator, denominator and
+        exponent per graph, so the values of each graph are transformed in
+        a single pass: y -> num * y^exp / den.
+
+        Returns:
+            list of new graphs and a message that describes what was done
+    """
+    num = np.ones(len(graphList))
+    den = np.ones(len(graphList))
+    exp = 1
+    x_den = 1.
+    msg = []
+    for arg in args:
+        # normalization for CV plots: 1/(num*y^exp/den)^2
+        if isinstance(arg, str) and arg in ["1/C^{2}", "CV"]:
+            num, den, exp = den*den, num*num, -2*exp
+            msg.append("Manipulated y-values by inverting their square")
+
+        # normalization via list of factors
+        elif isinstance(arg, list):
+            if len(graphList) != len(arg):
+                raise ValueError("Invalid normalization input! Number of "
+                                 "factors differs from the number of graphs.")
+            den = den * check_denominator(arg)
+            msg.append("Normalized y-values by given denominators")
+
+        # normalization via single factor
+        elif isinstance(arg, (float, int)) and not isinstance(arg, bool):
+            den = den * check_denominator(arg)
+            msg.append("Normalized y-values by given denominator {}".format(arg))
+
+        elif isinstance(arg, str) and "--x" in arg:
+            fac = [item for item in arg.split() if item != "--x"]
+            x_den = x_den * check_denominator(fac[0] if fac else None)
+            msg.append("Normalized x-values by given denominator {}".format(arg))
+
+        elif arg != "off":
+            print("Warning::Unknown normalization Input. Request rejected.")
+
+    new_list = []
+    for i, graph in enumerate(graphList):
+        x = graph[0]
+        if x_den != 1:
+            x = np.asarray(x, dtype=float) / x_den
+        y = graph[1]
+        if exp < 0:
+            base = np.asarray(y, dtype=float)**-exp * den[i]
+            # masked division, zeros are kept instead of becoming inf
+            y = np.divide(num[i], base, out=np.zeros_like(base),
+                          where=base != 0)
+        elif exp != 1 or num[i] != 1 or den[i] != 1:
+            y = np.asarray(y, dtype=float)**exp * num[i] / den[i]
+        new_list.append([x, y] + list(graph[2:]))
+
+    return new_list, ", ".join(msg)
+
+
+def check_denominator(arg):
+    """ Converts normalization denominators to floats and rejects zeros."""
+    try:
+        den = np.asarray(arg, dtype=float)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid normalization input! Denominators must be "
+                         "numbers.")
+    if np.any(den == 0):
+        raise ValueError("Invalid normalization input! Denominators must not "
+                         "be 0.")
+    return den
+
+
+def lttb_indices(x, y, n_out):
+    """ Selects 'n_out' points of a series with the Largest-Triangle-Three-
+        Buckets algorithm. The first and last point are always kept. Every
+        bucket in between contributes the point that spans the largest
+        triangle with the point selected before and the average of the next
+        bucket.
+
+        Returns:
+            array with the indices of the selected points in ascending order
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            nxt = slice(edges[i + 1], edges[i + 2])
+        else:
+            nxt = slice(n - 1, n)
+        avg_x = x[nxt].mean()
+        avg_y = y[nxt].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a])
+                      - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def minmax_indices(x, y, n_buckets, log_x=False):
+    """ Splits the x range into 'n_buckets' equally wide buckets (e.g. one
+        per pixel) and keeps the points with the lowest and highest y value
+        of every bucket as well as the first and last point of the series.
+        Points with NaN values are dropped. If x is not monotonic (e.g. a
+        sweep up and down again), the series is split into buckets of
+        equally many points instead, so that the branches aren't merged.
+
+        Returns:
+            array with the indices of the selected points in ascending order
+    """
+    n = len(x)
+    valid = np.flatnonzero(~(np.isnan(x) | np.isnan(y)))
+    if 2 * n_buckets + 2 >= valid.size or n_buckets < 1:
+        return np.arange(n)
+    if valid.size != n:
+        return valid[minmax_indices(x[valid], y[valid], n_buckets, log_x)]
+    step = np.diff(x)
+    if log_x and np.all(x > 0):
+        x = np.log10(x)
+    span = np.max(x) - np.min(x)
+    if (np.all(step >= 0) or np.all(step <= 0)) and np.isfinite(span) \
+            and span > 0:
+        bucket = np.minimum(((x - np.min(x)) / span * n_buckets).astype(int),
+                            n_buckets - 1)
     else:
-        print("Warning::Unknown normalization Input. Request rejected.")
+        bucket = np.arange(n) * n_buckets // n
+    # sorted by bucket and by y within each bucket
+    order = np.lexsort((y, bucket))
+    sorted_buckets = bucket[order]
+    first = np.flatnonzero(np.r_[True, sorted_buckets[1:] != sorted_buckets[:-1]])
+    last = np.r_[first[1:], n] - 1
+    return np.unique(np.concatenate(([0, n - 1], order[first], order[last])))
 
-    return graphList, msg
 
 def extractList(arg, output="int"):
     """ Turns a 'str(list)' into a list. Converts its elements into
@@ -24,6 +24,7 @@
 """Implementing communication with MySQL servers.
 """
 
+from collections import OrderedDict
 from io import IOBase
 import os
 import re
@@ -41,7 +42,7 @@ from .cursor import (
     CursorBase, MySQLCursor, MySQLCursorRaw,
     MySQLCursorBuffered, MySQLCursorBufferedRaw, MySQLCursorPrepared,
     MySQLCursorDict, MySQLCursorBufferedDict, MySQLCursorNamedTuple,
-    MySQLCursorBufferedNamedTuple)
+    MySQLCursorBufferedNamedTuple, MySQLCursorNumPy, MySQLCursorPreparedNumPy)
 from .network import MySQLUnixSocket, MySQLTCPSocket
 from .protocol import MySQLProtocol
 from .utils import int4store
@@ -78,6 +79,8 @@ DEFAULT_CONFIGURATION = {
     'force_ipv6': False,
     'auth_plugin': None,
     'allow_local_infile': True,
+    'stmt_cache_size': 32,
+    'max_allowed_packet': 1073741824,
 }
 
 
@@ -118,12 +121,15 @@ class MySQLConnection(object):
         self._raw = False
         self._in_transaction = False
 
-        self._prepared_statements = None
+        # server side prepared statements by SQL, least recently used first
+        self._prepared_statements = OrderedDict()
+        self._stmt_cache_size = DEFAULT_CONFIGURATION['stmt_cache_size']
 
         self._ssl_active = False
         self._auth_plugin = None
         self._pool_config_version = None
         self._compress = False
+        self._max_allowed_packet = DEFAULT_CONFIGURATION['max_allowed_packet']
 
         if len(kwargs) > 0:
             self.connect(**kwargs)
@@ -188,8 +194,9 @@ class MySQLConnection(object):
         """
         self._ssl_active = False
         if client_flags & ClientFlag.SSL and ssl_options:
-            packet = self._protocol.make_auth_ssl(charset=charset,
-                                                  client_flags=client_flags)
+            packet = self._protocol.make_auth_ssl(
+                charset=charset, client_flags=client_flags,
+                max_allowed_packet=self._max_allowed_packet)
             self._socket.send(packet)
             self._socket.switch_to_ssl(**ssl_options)
             self._ssl_active = True
@@ -198,6 +205,7 @@ class MySQLConnection(object):
             handshake=self._handshake,
             username=username, password=password, database=database,
             charset=charset, client_flags=client_flags,
+            max_allowed_packet=self._max_allowed_packet,
             ssl_enabled=self._ssl_active,
             auth_plugin=self._auth_plugin)
         self._socket.send(packet)
@@ -347,6 +355,12 @@ class MySQLConnection(object):
                 "TCP/IP port number should be an integer")
 
         # Other configuration
+        try:
+            self._max_allowed_packet = int(config['max_allowed_packet'])
+            del config['max_allowed_packet']
+        except KeyError:
+            pass  # Missing max_allowed_packet argument is OK
+
         set_ssl_flag = False
         for key, value in config.items():
             try:
@@ -413,6 +427,7 @@ class MySQLConnection(object):
 
         Raises on errors.
         """
+        self._prepared_statements.clear()
         self._socket = self._get_connection()
         self._socket.open_connection()
         self._do_handshake()
@@ -422,6 +437,7 @@ class MySQLConnection(object):
         self.set_converter_class(self._converter_class)
         if self._client_flags & ClientFlag.COMPRESS:
             self._socket.recv = self._socket.recv_compressed
+            self._socket.recv_view = self._socket.recv_view_compressed
             self._socket.send = self._socket.send_compressed
 
     def _post_connection(self):
@@ -498,9 +514,13 @@ class MySQLConnection(object):
         if self.unread_result:
             raise errors.InternalError("Unread result found.")
 
+        data = packet or argument
+        if data and len(data) > self._max_allowed_packet:
+            raise errors.InterfaceError(errno=2020)
+
         try:
             self._socket.send(
-                self._protocol.make_command(command, packet or argument),
+                self._protocol.make_command(command, data),
                 packet_number)
         except AttributeError:
             raise errors.OperationalError("MySQL Connection not available.")
@@ -675,6 +695,32 @@ class MySQLConnection(object):
 
         return rows
 
+    def get_columns(self, column_count, count=None, binary=False,
+                    columns=None):
+        """Get all rows returned by the MySQL server column by column
+
+        This method works like get_rows(), but the values are returned as
+        one list per column. For binary results, columns must hold the
+        description of the result's columns. The result is a tuple
+        consisting of a list of columns and the EOF packet.
+
+        Returns a tuple()
+        """
+        if not self.unread_result:
+            raise errors.InternalError("No result set available.")
+
+        if binary:
+            result = self._protocol.read_binary_result_columns(
+                self._socket, columns, count)
+        else:
+            result = self._protocol.read_text_result_columns(
+                self._socket, column_count, count)
+        if result[-1] is not None:
+            self._handle_server_status(result[-1]['status_flag'])
+            self.unread_result = False
+
+        return result
+
     def get_row(self, binary=False, columns=None):
         """Get the next rows returned by the MySQL server
 
@@ -897,6 +943,8 @@ class MySQLConnection(object):
             ssl_enabled=self._ssl_active,
             auth_plugin=self._auth_plugin)
         self._socket.send(packet, 0)
+        # the server deallocates all prepared statements of the session
+        self._prepared_statements.clear()
 
         ok_packet = self._auth_switch_request(username, password)
 
@@ -1357,7 +1405,7 @@ class MySQLConnection(object):
             "(implies retrieving warnings).")
 
     def cursor(self, buffered=None, raw=None, prepared=None, cursor_class=None,
-               dictionary=None, named_tuple=None):
+               dictionary=None, named_tuple=None, columnar=None):
         """Instantiates and returns a cursor
 
         By default, MySQLCursor is returned. Depending on the options
@@ -1366,7 +1414,10 @@ class MySQLConnection(object):
         returned as dictionary or named tuple.
 
         Dictionary and namedtuple based cursors are available with buffered
-        output but not raw.
+        output but not raw. A columnar cursor returns NumPy arrays through
+        fetch_columns() and is only available unbuffered. A prepared
+        columnar cursor does the same with server side prepared statements
+        which are kept in the statement cache of the connection.
 
         It is possible to also give a custom cursor through the
         cursor_class parameter, but it needs to be a subclass of
@@ -1401,6 +1452,8 @@ class MySQLConnection(object):
             cursor_type |= 8
         if prepared is True:
             cursor_type |= 16
+        if columnar is True:
+            cursor_type |= 32
 
         types = {
             0: MySQLCursor,  # 0
@@ -1411,14 +1464,17 @@ class MySQLConnection(object):
             5: MySQLCursorBufferedDict,
             8: MySQLCursorNamedTuple,
             9: MySQLCursorBufferedNamedTuple,
-            16: MySQLCursorPrepared
+            16: MySQLCursorPrepared,
+            32: MySQLCursorNumPy,
+            48: MySQLCursorPreparedNumPy
         }
         try:
             return (types[cursor_type])(self)
         except KeyError:
-            args = ('buffered', 'raw', 'dictionary', 'named_tuple', 'prepared')
+            args = ('buffered', 'raw', 'dictionary', 'named_tuple', 'prepared',
+                    'columnar')
             raise ValueError('Cursor not available with given criteria: ' +
-                             ', '.join([args[i] for i in range(5)
+                             ', '.join([args[i] for i in range(6)
                                         if cursor_type & (1 << i) != 0]))
 
     def start_transaction(self, consistent_snapshot=False,
@@ -1582,6 +1638,27 @@ class MySQLConnection(object):
 
         return result
 
+    def cmd_stmt_prepare_cached(self, statement):
+        """Prepare a MySQL statement or reuse it from the statement cache
+
+        Statements prepared through this method stay allocated on the
+        server and are reused whenever the same statement is prepared
+        again on this connection. When more than stmt_cache_size
+        statements are cached, the least recently used one is
+        deallocated. Cached statements must not be closed by the caller.
+
+        Returns a dict()
+        """
+        try:
+            result = self._prepared_statements.pop(statement)
+        except KeyError:
+            result = self.cmd_stmt_prepare(statement)
+        self._prepared_statements[statement] = result
+        while len(self._prepared_statements) > max(self._stmt_cache_size, 1):
+            (_, dropped) = self._prepared_statements.popitem(last=False)
+            self.cmd_stmt_close(dropped['statement_id'])
+        return result
+
     def cmd_stmt_execute(self, statement_id, data=(), parameters=(), flags=0):
         """Execute a prepared MySQL statement"""
         parameters = list(parameters)
@@ -1674,4 +1751,6 @@ class MySQLConnection(object):
                                            "earlier does not support "
                                            "COM_RESET_CONNECTION.")
         self._handle_ok(self._send_cmd(ServerCmd.RESET_CONNECTION))
+        # the server deallocates all prepared statements of the session
+        self._prepared_statements.clear()
         self._post_connection()
@@ -28,10 +28,16 @@ import datetime
 import time
 from decimal import Decimal
 
+from . import errors
 from .constants import FieldType, FieldFlag, CharacterSet
 from .catch23 import PY2, NUMERIC_TYPES, struct_unpack
 from .custom_types import HexLiteral
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class MySQLConverterBase(object):
     """Base class for conversion classes
@@ -76,6 +82,16 @@ class MySQLConverterBase(object):
         """Convert MySQL data type to Python"""
         return value
 
+    def rows_to_python(self, rows, fields):
+        """Convert MySQL text result rows to Python types
+
+        Converts the rows one by one using row_to_python(); subclasses can
+        override this to convert many rows at once.
+
+        Returns a list of tuples.
+        """
+        return [self.row_to_python(row, fields) for row in rows]
+
     def escape(self, buf):
         """Escape buffer for sending to MySQL"""
         return buf
@@ -102,6 +118,7 @@ class MySQLConverter(MySQLConverterBase):
     def __init__(self, charset=None, use_unicode=True):
         MySQLConverterBase.__init__(self, charset, use_unicode)
         self._cache_field_types = {}
+        self._cache_plan = (None, None)
 
     def escape(self, value):
         """
@@ -335,15 +352,7 @@ class MySQLConverter(MySQLConverterBase):
         if value is None:
             return None
 
-        if not self._cache_field_types:
-            self._cache_field_types = {}
-            for name, info in FieldType.desc.items():
-                try:
-                    self._cache_field_types[info[0]] = getattr(
-                        self, '_{0}_to_python'.format(name))
-                except AttributeError:
-                    # We ignore field types which has no method
-                    pass
+        self._field_type_converters()
 
         try:
             return self._cache_field_types[flddsc[1]](value, flddsc)
@@ -360,18 +369,8 @@ class MySQLConverter(MySQLConverterBase):
         except:
             raise
 
-    def row_to_python(self, row, fields):
-        """Convert a MySQL text result row to Python types
-
-        The row argument is a sequence containing text result returned
-        by a MySQL server. Each value of the row is converted to the
-        using the field type information in the fields argument.
-
-        Returns a tuple.
-        """
-        i = 0
-        result = [None]*len(fields)
-
+    def _field_type_converters(self):
+        """Returns the field type to converter mapping, building it once"""
         if not self._cache_field_types:
             self._cache_field_types = {}
             for name, info in FieldType.desc.items():
@@ -381,30 +380,228 @@ class MySQLConverter(MySQLConverterBase):
                 except AttributeError:
                     # We ignore field types which has no method
                     pass
+        return self._cache_field_types
 
-        for field in fields:
-            field_type = field[1]
+    def conversion_plan(self, fields):
+        """Compile the conversion plan for the columns of a result set
 
-            if (row[i] == 0 and field_type != FieldType.BIT) or row[i] is None:
-                # Don't convert NULL value
-                i += 1
-                continue
+        The fields argument is the description of the result set (see
+        MySQLCursor.description). For every column the converter is looked
+        up once and bound to the column's description, so converting a row
+        does not need any type dispatching. Numbers which are converted by
+        the default methods of this class use int() and float() directly.
+        The plan of the last result set is kept, as long as the same fields
+        object is passed it is not compiled again.
+
+        Returns a tuple (converters, numeric) where converters holds one
+        callable per column taking the value, and numeric is True when all
+        columns are converted by int() or float().
+        """
+        cached_fields, plan = self._cache_plan
+        if fields is cached_fields:
+            return plan
 
+        converters = self._field_type_converters()
+        plan_converters = []
+        for field in fields:
             try:
-                result[i] = self._cache_field_types[field_type](row[i], field)
+                converter = converters[field[1]]
             except KeyError:
-                # If one type is not defined, we just return the value as str
-                try:
-                    result[i] = row[i].decode('utf-8')
-                except UnicodeDecodeError:
-                    result[i] = row[i]
-            except (ValueError, TypeError) as err:
+                plan_converters.append(self._undefined_to_python)
+                continue
+            func = getattr(converter, '__func__', None)
+            if func is MySQLConverter.__dict__['_INT_to_python']:
+                plan_converters.append(int)
+            elif func is MySQLConverter.__dict__['_FLOAT_to_python']:
+                plan_converters.append(float)
+            else:
+                plan_converters.append(
+                    lambda value, conv=converter, field=field:
+                    conv(value, field))
+        numeric = all(conv in (int, float) for conv in plan_converters)
+        plan = (tuple(plan_converters), numeric)
+        self._cache_plan = (fields, plan)
+        return plan
+
+    @staticmethod
+    def _undefined_to_python(value):
+        """Returns value of a type without converter as str if possible"""
+        try:
+            return value.decode('utf-8')
+        except UnicodeDecodeError:
+            return value
+
+    def _plan_error(self, err, row, fields):
+        """Adds the name of the field which failed to convert to err"""
+        converters = self.conversion_plan(fields)[0]
+        for value, conv, field in zip(row, converters, fields):
+            if value is None:
+                continue
+            try:
+                conv(value)
+            except (ValueError, TypeError):
                 err.message = "{0} (field {1})".format(str(err), field[0])
-                raise
+                break
+        return err
 
-            i += 1
+    def row_to_python(self, row, fields):
+        """Convert a MySQL text result row to Python types
 
-        return tuple(result)
+        The row argument is a sequence containing text result returned
+        by a MySQL server. Each value of the row is converted to the
+        using the field type information in the fields argument.
+
+        Returns a tuple.
+        """
+        converters = self.conversion_plan(fields)[0]
+        try:
+            return tuple([None if value is None else conv(value)
+                          for conv, value in zip(converters, row)])
+        except (ValueError, TypeError) as err:
+            raise self._plan_error(err, row, fields)
+
+    def rows_to_python(self, rows, fields):
+        """Convert many MySQL text result rows to Python types
+
+        Like row_to_python(), but the conversion plan is looked up once for
+        all rows. When all columns are numeric, the rows are converted
+        without checking every value for NULL; only rows containing NULL
+        take the slower path.
+
+        Returns a list of tuples.
+        """
+        converters, numeric = self.conversion_plan(fields)
+        result = []
+        append = result.append
+        row = None
+        try:
+            if numeric:
+                for row in rows:
+                    try:
+                        append(tuple([conv(value) for conv, value
+                                      in zip(converters, row)]))
+                    except TypeError:
+                        if None not in row:
+                            raise
+                        append(tuple([None if value is None else conv(value)
+                                      for conv, value in zip(converters, row)
+                                     ]))
+            else:
+                for row in rows:
+                    append(tuple([None if value is None else conv(value)
+                                  for conv, value in zip(converters, row)]))
+        except (ValueError, TypeError) as err:
+            raise self._plan_error(err, row, fields)
+        return result
+
+    def column_to_numpy(self, values, field):
+        """Convert a column of a MySQL text result to a NumPy array
+
+        The values argument is a list with the raw values of one column as
+        returned by MySQLConnection.get_columns() and field is the column's
+        element from MySQLCursor.description. Numbers and dates are parsed
+        by NumPy in one go instead of value by value:
+
+         o FLOAT, DOUBLE and DECIMAL columns become float64 arrays
+         o integer columns become int64 (uint64 for unsigned BIGINT) or
+           float64 arrays when they contain NULL
+         o DATETIME and TIMESTAMP columns become datetime64[us] and DATE
+           columns datetime64[D] arrays, NULL and zero dates become NaT
+         o all other columns become object arrays holding the values
+           to_python() returns
+
+        Raises InterfaceError when NumPy is not available.
+
+        Returns a numpy.ndarray.
+        """
+        if numpy is None:
+            raise errors.InterfaceError(
+                "NumPy is required for converting columns to arrays")
+        field_type = field[1]
+        if field_type in (FieldType.FLOAT, FieldType.DOUBLE,
+                          FieldType.DECIMAL, FieldType.NEWDECIMAL):
+            return self._numbers_to_numpy(values, numpy.float64)
+        if field_type in (FieldType.TINY, FieldType.SHORT, FieldType.INT24,
+                          FieldType.LONG, FieldType.LONGLONG,
+                          FieldType.YEAR):
+            if None in values:
+                return self._numbers_to_numpy(values, numpy.float64)
+            if field_type == FieldType.LONGLONG and \
+                    field[7] & FieldFlag.UNSIGNED:
+                return self._numbers_to_numpy(values, numpy.uint64)
+            return self._numbers_to_numpy(values, numpy.int64)
+        if field_type in (FieldType.DATETIME, FieldType.TIMESTAMP):
+            return self._dates_to_numpy(values, 'datetime64[us]')
+        if field_type in (FieldType.DATE, FieldType.NEWDATE):
+            return self._dates_to_numpy(values, 'datetime64[D]')
+        column = numpy.empty(len(values), dtype=object)
+        column[:] = [self.to_python(field, value) for value in values]
+        return column
+
+    def binary_column_to_numpy(self, values, field):
+        """Convert a column of a MySQL binary result to a NumPy array
+
+        Like column_to_numpy(), but for values which were already decoded
+        by the binary protocol (see MySQLProtocol.read_binary_result()).
+        Numbers and dates are copied into the arrays without parsing any
+        text, only DECIMAL columns are sent as text by MySQL.
+
+        Raises InterfaceError when NumPy is not available.
+
+        Returns a numpy.ndarray.
+        """
+        if numpy is None:
+            raise errors.InterfaceError(
+                "NumPy is required for converting columns to arrays")
+        field_type = field[1]
+        if field_type in (FieldType.DECIMAL, FieldType.NEWDECIMAL):
+            return self._numbers_to_numpy(
+                [None if value is None else bytes(value) for value in values],
+                numpy.float64)
+        if field_type in (FieldType.FLOAT, FieldType.DOUBLE):
+            return numpy.array(values, dtype=numpy.float64)
+        if field_type in (FieldType.TINY, FieldType.SHORT, FieldType.INT24,
+                          FieldType.LONG, FieldType.LONGLONG):
+            if None in values:
+                return numpy.array(values, dtype=numpy.float64)
+            if field_type == FieldType.LONGLONG and \
+                    field[7] & FieldFlag.UNSIGNED:
+                return numpy.array(values, dtype=numpy.uint64)
+            return numpy.array(values, dtype=numpy.int64)
+        if field_type in (FieldType.DATETIME, FieldType.TIMESTAMP):
+            return numpy.array(values, dtype='datetime64[us]')
+        if field_type == FieldType.DATE:
+            return numpy.array(values, dtype='datetime64[D]')
+        column = numpy.empty(len(values), dtype=object)
+        column[:] = [self.to_python(field, value)
+                     if isinstance(value, (bytes, bytearray)) else value
+                     for value in values]
+        return column
+
+    @staticmethod
+    def _numbers_to_numpy(values, dtype):
+        """Parses a list of numbers in text form, NULL becomes NaN"""
+        if None in values:
+            values = [b'nan' if value is None else value for value in values]
+        return numpy.array(values, dtype=bytes).astype(dtype)
+
+    @staticmethod
+    def _dates_to_numpy(values, dtype):
+        """Parses a list of dates in text form, NULL and invalid dates
+        (e.g. '0000-00-00') become NaT"""
+        if None in values:
+            values = [b'NaT' if value is None else value for value in values]
+        try:
+            return numpy.array(values, dtype=bytes).astype(dtype)
+        except ValueError:
+            pass
+        column = numpy.empty(len(values), dtype=dtype)
+        for i, value in enumerate(values):
+            try:
+                column[i] = numpy.datetime64(value.decode('ascii'))
+            except ValueError:
+                column[i] = numpy.datetime64('NaT')
+        return column
 
     def _FLOAT_to_python(self, value, desc=None):  # pylint: disable=C0103
         """
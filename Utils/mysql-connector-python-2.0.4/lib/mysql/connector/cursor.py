@@ -24,7 +24,7 @@
 """Cursor classes
 """
 
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 import re
 import weakref
 
@@ -825,8 +825,7 @@ class MySQLCursor(CursorBase):
         (rows, eof) = self._connection.get_rows()
         if self._nextrow[0]:
             rows.insert(0, self._nextrow[0])
-        res = [self._connection.converter.row_to_python(row, self.description)
-               for row in rows]
+        res = self._connection.converter.rows_to_python(rows, self.description)
         self._handle_eof(eof)
         rowcount = len(rows)
         if rowcount >= 0 and self._rowcount == -1:
@@ -920,10 +919,8 @@ class MySQLCursorBuffered(MySQLCursor):
     def fetchall(self):
         if self._rows is None:
             raise errors.InterfaceError("No result set to fetch from.")
-        res = []
-        for row in self._rows[self._next_row:]:
-            res.append(self._connection.converter.row_to_python(
-                row, self.description))
+        res = self._connection.converter.rows_to_python(
+            self._rows[self._next_row:], self.description)
         self._next_row = len(self._rows)
         return res
 
@@ -988,6 +985,101 @@ class MySQLCursorBufferedRaw(MySQLCursorBuffered):
         return self._rows is not None
 
 
+class MySQLCursorNumPy(MySQLCursor):
+    """
+    Cursor which decodes the result set column by column into NumPy arrays.
+
+    fetch_columns() reads the remaining rows straight into one list per
+    column and converts each column with a single NumPy call, so neither
+    a tuple nor Python objects are created for every row. iter_columns()
+    does the same in chunks of a fixed number of rows, so that only one
+    chunk is held in memory at a time. The fetch* methods of MySQLCursor
+    are still available.
+    """
+    def _read_columns(self, count=None):
+        """Reads all or given number of rows column by column
+
+        Returns a list with one list of values per column.
+        """
+        if self._nextrow[0] and count is not None:
+            count -= 1
+        (columns, eof) = self._connection.get_columns(
+            len(self.description), count)
+        if self._nextrow[0]:
+            # row read ahead by fetchone(), its values are bytearrays
+            for column, value in zip(columns, self._nextrow[0]):
+                column.insert(0, None if value is None else bytes(value))
+            self._nextrow = (None, None)
+        if eof is not None:
+            self._handle_eof(eof)
+        if self._rowcount == -1:
+            self._rowcount = 0
+        self._rowcount += len(columns[0]) if columns else 0
+        return columns
+
+    def _column_keys(self):
+        """Returns the keys of the columns in fetch_columns()
+
+        The keys are the column names. A name which occurs again, e.g. in
+        'SELECT a.id, b.id', gets the suffix '_1', '_2', ... so that no
+        column is lost.
+
+        Returns a list.
+        """
+        keys = []
+        for name in self.column_names:
+            key = name
+            i = 0
+            while key in keys:
+                i += 1
+                key = '{0}_{1}'.format(name, i)
+            keys.append(key)
+        return keys
+
+    def _columns_to_numpy(self, columns):
+        """Converts column lists into an OrderedDict of NumPy arrays"""
+        converter = self._connection.converter
+        return OrderedDict(
+            (key, converter.column_to_numpy(column, field))
+            for key, field, column in zip(self._column_keys(),
+                                          self.description, columns))
+
+    def fetch_columns(self):
+        """Returns the remaining rows of the result set as NumPy arrays
+
+        See MySQLConverter.column_to_numpy() for the array types and
+        _column_keys() for columns with the same name.
+
+        Returns an OrderedDict mapping column names to arrays.
+        """
+        if not self._have_unread_result():
+            raise errors.InterfaceError(_ERR_NO_RESULT_TO_FETCH)
+        return self._columns_to_numpy(self._read_columns())
+
+    def iter_columns(self, size=10000):
+        """Iterates over the remaining rows of the result set in chunks
+
+        Each chunk holds at most size rows and is returned like the result
+        of fetch_columns(). The rows are read from the socket only when the
+        next chunk is requested. When the iteration is stopped early, the
+        rest of the result set is read and discarded chunk by chunk.
+
+        Returns a generator of OrderedDicts mapping column names to arrays.
+        """
+        if not self._have_unread_result():
+            raise errors.InterfaceError(_ERR_NO_RESULT_TO_FETCH)
+        if size < 1:
+            raise errors.ProgrammingError("Chunk size must be at least 1")
+        try:
+            while self._have_unread_result():
+                columns = self._read_columns(size)
+                if columns and columns[0]:
+                    yield self._columns_to_numpy(columns)
+        finally:
+            while self._have_unread_result():
+                self._read_columns(size)
+
+
 class MySQLCursorPrepared(MySQLCursor):
     """Cursor using MySQL Prepared Statements
     """
@@ -1139,6 +1231,90 @@ class MySQLCursorPrepared(MySQLCursor):
         return rows
 
 
+class MySQLCursorPreparedNumPy(MySQLCursorNumPy, MySQLCursorPrepared):
+    """
+    Cursor using cached MySQL Prepared Statements and NumPy arrays.
+
+    Statements are prepared through the statement cache of the connection
+    (see MySQLConnection.cmd_stmt_prepare_cached()), so executing the same
+    operation again, also from another cursor, skips the PREPARE round
+    trip. Results are sent in the binary protocol, numbers and dates are
+    therefore copied into the arrays of fetch_columns() and iter_columns()
+    without parsing text.
+    """
+    def close(self):
+        """Close the cursor
+
+        The prepared statement stays in the statement cache of the
+        connection.
+        """
+        self._prepared = None
+        return MySQLCursor.close(self)
+
+    def execute(self, operation, params=(), multi=False):  # multi is unused
+        """Execute a MySQL Prepared Statement from the statement cache
+
+        The operation is prepared only when it is not found in the
+        statement cache of the connection.
+        """
+        try:
+            if not isinstance(operation, bytes):
+                operation = operation.encode(self._connection.charset)
+        except (UnicodeDecodeError, UnicodeEncodeError) as err:
+            raise errors.ProgrammingError(str(err))
+
+        # need to convert %s to ? before sending it to MySQL
+        if b'%s' in operation:
+            operation = re.sub(RE_SQL_FIND_PARAM, b'?', operation)
+
+        self._reset_result()
+        self._executed = operation
+        self._prepared = self._connection.cmd_stmt_prepare_cached(operation)
+
+        if len(self._prepared['parameters']) != len(params):
+            raise errors.ProgrammingError(
+                errno=1210,
+                msg="Incorrect number of arguments " \
+                    "executing prepared statement")
+
+        # no long data is sent, hence the statement needs no reset
+        res = self._connection.cmd_stmt_execute(
+            self._prepared['statement_id'],
+            data=params,
+            parameters=self._prepared['parameters'])
+        self._handle_result(res)
+
+    def _read_columns(self, count=None):
+        """Reads all or given number of binary rows column by column
+
+        Returns a list with one list of values per column.
+        """
+        if self._nextrow[0] and count is not None:
+            count -= 1
+        (columns, eof) = self._connection.get_columns(
+            len(self.description), count, binary=True,
+            columns=self.description)
+        if self._nextrow[0]:
+            # row read ahead by fetchone()
+            for column, value in zip(columns, self._nextrow[0]):
+                column.insert(0, value)
+            self._nextrow = (None, None)
+        if eof is not None:
+            self._handle_eof(eof)
+        if self._rowcount == -1:
+            self._rowcount = 0
+        self._rowcount += len(columns[0]) if columns else 0
+        return columns
+
+    def _columns_to_numpy(self, columns):
+        """Converts column lists into an OrderedDict of NumPy arrays"""
+        converter = self._connection.converter
+        return OrderedDict(
+            (key, converter.binary_column_to_numpy(column, field))
+            for key, field, column in zip(self._column_keys(),
+                                          self.description, columns))
+
+
 class MySQLCursorDict(MySQLCursor):
     """
     Cursor fetching rows as dictionaries.
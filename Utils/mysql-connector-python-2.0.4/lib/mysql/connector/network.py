@@ -39,6 +39,13 @@ except:
 from . import constants, errors
 from .catch23 import PY2, init_bytearray, struct_unpack
 
+# size of the buffer incoming packets are read into; larger packets are
+# read into a buffer of their own
+RECV_BUFFER_SIZE = 256 * 1024
+
+# maximum size of the chunks compressed packets are decompressed in
+ZIP_CHUNK_SIZE = 64 * 1024
+
 
 def _strioerror(err):
     """Reformat the IOError error message
@@ -81,6 +88,14 @@ class BaseMySQLSocket(object):
         self._packet_number = -1
         self._packet_queue = deque()
         self.recvsize = 8192
+        self._recv_buffer = None
+        self._recv_view = None
+        self._recv_start = 0  # first unread byte in the receive buffer
+        self._recv_end = 0  # end of the received bytes
+        self._zip_buffer = None  # decompressed packets
+        self._zip_view = None
+        self._zip_start = 0
+        self._zip_end = 0
 
     @property
     def next_packet_number(self):
@@ -216,43 +231,93 @@ class BaseMySQLSocket(object):
             except AttributeError:
                 raise errors.OperationalError(errno=2006)
 
-    def recv_plain(self):
-        """Receive packets from the MySQL server"""
-        try:
-            # Read the header of the MySQL packet, 4 bytes
-            packet = bytearray(b'')
-            packet_len = 0
-            while packet_len < 4:
-                chunk = self.sock.recv(4 - packet_len)
-                if not chunk:
-                    raise errors.InterfaceError(errno=2013)
-                packet += chunk
-                packet_len = len(packet)
-
-            # Save the packet number and payload length
-            self._packet_number = packet[3]
-            if PY2:
-                payload_len = struct.unpack_from(
-                    "<I",
-                    buffer(packet[0:3] + b'\x00'))[0]  # pylint: disable=E0602
-            else:
-                payload_len = struct.unpack("<I", packet[0:3] + b'\x00')[0]
+    def _fill_recv_buffer(self, size):
+        """Read from the socket until size unread bytes are buffered
 
-            # Read the payload
-            rest = payload_len
-            packet.extend(bytearray(payload_len))
-            packet_view = memoryview(packet)  # pylint: disable=E0602
-            packet_view = packet_view[4:]
-            while rest:
-                read = self.sock.recv_into(packet_view, rest)
-                if read == 0 and rest > 0:
-                    raise errors.InterfaceError(errno=2013)
-                packet_view = packet_view[read:]
-                rest -= read
-            return packet
+        The socket is read with recv_into() in chunks as large as the free
+        space of the receive buffer, so that a single system call usually
+        fetches many packets. Unread bytes are moved to the front of the
+        buffer when the packet would not fit behind them.
+        """
+        if self._recv_buffer is None:
+            self._recv_buffer = bytearray(RECV_BUFFER_SIZE)
+            self._recv_view = memoryview(self._recv_buffer)
+        unread = self._recv_end - self._recv_start
+        if unread >= size:
+            return
+        if self._recv_start + size > len(self._recv_buffer):
+            self._recv_buffer[0:unread] = \
+                self._recv_view[self._recv_start:self._recv_end]
+            self._recv_start = 0
+            self._recv_end = unread
+        while self._recv_end - self._recv_start < size:
+            read = self.sock.recv_into(self._recv_view[self._recv_end:])
+            if not read:
+                raise errors.InterfaceError(errno=2013)
+            self._recv_end += read
+
+    def _recv_frame(self, header_size):
+        """Receive a packet or a compressed packet as memoryview
+
+        The header_size is 4 for packets and 7 for compressed packets, both
+        headers start with the length of the payload following them.
+        The view points into the receive buffer and is only valid until
+        the next packet is received. Packets which are larger than the
+        receive buffer get a buffer of their own.
+        """
+        try:
+            self._fill_recv_buffer(header_size)
+            start = self._recv_start
+            header = self._recv_buffer
+            packet_len = header_size + (header[start] | header[start + 1] << 8
+                                        | header[start + 2] << 16)
+
+            if packet_len > len(self._recv_buffer):
+                packet = bytearray(packet_len)
+                have = self._recv_end - start
+                packet[0:have] = self._recv_view[start:self._recv_end]
+                self._recv_start = self._recv_end = 0
+                packet_view = memoryview(packet)[have:]
+                while packet_view:
+                    read = self.sock.recv_into(packet_view, len(packet_view))
+                    if not read:
+                        raise errors.InterfaceError(errno=2013)
+                    packet_view = packet_view[read:]
+                return memoryview(packet)
+
+            self._fill_recv_buffer(packet_len)
+            start = self._recv_start
+            self._recv_start += packet_len
+            if self._recv_start == self._recv_end:
+                self._recv_start = self._recv_end = 0
+            return self._recv_view[start:start + packet_len]
         except IOError as err:
+            self._recv_start = self._recv_end = 0
             raise errors.OperationalError(
                 errno=2055, values=(self.get_address(), _strioerror(err)))
+        except errors.Error:
+            # the connection is broken, drop what is left of the packet
+            self._recv_start = self._recv_end = 0
+            raise
+
+    def _recv_packet(self):
+        """Receive a packet as memoryview (see _recv_frame())"""
+        packet = self._recv_frame(4)
+        # Save the packet number
+        self._packet_number = packet[3]
+        return packet
+
+    def recv_plain(self):
+        """Receive packets from the MySQL server"""
+        return bytearray(self._recv_packet())
+
+    def recv_view_plain(self):
+        """Receive packets from the MySQL server without copying them
+
+        Returns a memoryview which is only valid until the next packet is
+        received. Use recv_plain() for packets which are kept.
+        """
+        return self._recv_packet()
 
     def recv_py26_plain(self):
         """Receive packets from the MySQL server"""
@@ -288,78 +353,119 @@ class BaseMySQLSocket(object):
     if sys.version_info[0:2] == (2, 6):
         recv = recv_py26_plain
         recv_plain = recv_py26_plain
+        recv_view = recv_py26_plain
     else:
         recv = recv_plain
+        recv_view = recv_view_plain
 
-    def _split_zipped_payload(self, packet_bunch):
-        """Split compressed payload"""
-        while packet_bunch:
-            payload_length = struct_unpack("<I",
-                                           packet_bunch[0:3] + b'\x00')[0]
-            self._packet_queue.append(packet_bunch[0:payload_length + 4])
-            packet_bunch = packet_bunch[payload_length + 4:]
+    def _reserve_zip_buffer(self, size):
+        """Make room for size bytes behind the unread decompressed bytes
 
-    def recv_compressed(self):
-        """Receive compressed packets from the MySQL server"""
-        try:
-            return self._packet_queue.popleft()
-        except IndexError:
-            pass
+        Unread bytes are moved to the front of the zip buffer. A larger
+        buffer is only allocated when they don't fit together, and the
+        default size is restored once a large packet was read.
+        """
+        unread = self._zip_end - self._zip_start
+        need = unread + size
+        if self._zip_buffer is None or need > len(self._zip_buffer) or (
+                len(self._zip_buffer) > RECV_BUFFER_SIZE
+                and need <= RECV_BUFFER_SIZE):
+            zip_buffer = bytearray(max(need, RECV_BUFFER_SIZE))
+            if unread:
+                zip_buffer[0:unread] = \
+                    self._zip_view[self._zip_start:self._zip_end]
+            self._zip_buffer = zip_buffer
+            self._zip_view = memoryview(zip_buffer)
+        elif self._zip_end + size > len(self._zip_buffer):
+            self._zip_buffer[0:unread] = \
+                self._zip_view[self._zip_start:self._zip_end]
+        else:
+            return
+        self._zip_start = 0
+        self._zip_end = unread
 
-        header = bytearray(b'')
-        packets = []
-        try:
-            abyte = self.sock.recv(1)
-            while abyte and len(header) < 7:
-                header += abyte
-                abyte = self.sock.recv(1)
-            while header:
-                if len(header) < 7:
-                    raise errors.InterfaceError(errno=2013)
-                zip_payload_length = struct_unpack("<I",
-                                                   header[0:3] + b'\x00')[0]
-                payload_length = struct_unpack("<I", header[4:7] + b'\x00')[0]
-                zip_payload = init_bytearray(abyte)
-                while len(zip_payload) < zip_payload_length:
-                    chunk = self.sock.recv(zip_payload_length
-                                           - len(zip_payload))
-                    if len(chunk) == 0:
-                        raise errors.InterfaceError(errno=2013)
-                    zip_payload = zip_payload + chunk
-                if payload_length == 0:
-                    self._split_zipped_payload(zip_payload)
-                    return self._packet_queue.popleft()
-                packets.append(header + zip_payload)
-                if payload_length != 16384:
+    def _fill_zip_buffer(self, size):
+        """Decompress packets until size unread bytes are buffered
+
+        Compressed packets are received like other packets and decompressed
+        chunk by chunk right behind the unread bytes of the zip buffer, so
+        packets spanning several compressed packets need no joining.
+        """
+        while self._zip_end - self._zip_start < size:
+            frame = self._recv_frame(7)
+            payload_len = frame[4] | frame[5] << 8 | frame[6] << 16
+            if payload_len == 0:
+                # payload was sent uncompressed
+                payload_len = len(frame) - 7
+                self._reserve_zip_buffer(payload_len)
+                self._zip_buffer[self._zip_end:self._zip_end + payload_len] = \
+                    frame[7:]
+                self._zip_end += payload_len
+                continue
+
+            self._reserve_zip_buffer(payload_len)
+            limit = self._zip_end + payload_len
+            decompressor = zlib.decompressobj()
+            data = frame[7:].tobytes() if PY2 else frame[7:]
+            while True:
+                if data:
+                    chunk = decompressor.decompress(data, ZIP_CHUNK_SIZE)
+                    data = decompressor.unconsumed_tail
+                else:
+                    chunk = decompressor.flush()
+                if self._zip_end + len(chunk) > limit:
+                    raise errors.InterfaceError(errno=2027)
+                self._zip_buffer[self._zip_end:self._zip_end + len(chunk)] = \
+                    chunk
+                self._zip_end += len(chunk)
+                if not data and not chunk:
                     break
-                header = init_bytearray(b'')
-                abyte = self.sock.recv(1)
-                while abyte and len(header) < 7:
-                    header += abyte
-                    abyte = self.sock.recv(1)
+            if self._zip_end != limit:
+                raise errors.InterfaceError(errno=2027)
+
+    def recv_view_compressed(self):
+        """Receive compressed packets from the MySQL server without copying
+
+        Returns a memoryview which is only valid until the next packet is
+        received, or None when the connection was closed between packets.
+        """
+        try:
+            if self._zip_start == self._zip_end and \
+                    self._recv_start == self._recv_end:
+                self._fill_recv_buffer(1)
+        except errors.InterfaceError:
+            return None
         except IOError as err:
             raise errors.OperationalError(
                 errno=2055, values=(self.get_address(), _strioerror(err)))
 
-        tmp = init_bytearray(b'')
-        for packet in packets:
-            payload_length = struct_unpack("<I", header[4:7] + b'\x00')[0]
-            if payload_length == 0:
-                tmp.append(packet[7:])
-            else:
-                if PY2:
-                    tmp += zlib.decompress(
-                        buffer(packet[7:]))  # pylint: disable=E0602
-                else:
-                    tmp += zlib.decompress(packet[7:])
-
-        self._split_zipped_payload(tmp)
-        del tmp
-
         try:
-            return self._packet_queue.popleft()
-        except IndexError:
-            pass
+            self._fill_zip_buffer(4)
+            start = self._zip_start
+            header = self._zip_buffer
+            packet_len = 4 + (header[start] | header[start + 1] << 8
+                              | header[start + 2] << 16)
+            self._fill_zip_buffer(packet_len)
+        except zlib.error:
+            self._zip_start = self._zip_end = 0
+            raise errors.InterfaceError(errno=2027)
+        except errors.Error:
+            # the connection is broken, drop what is left of the packet
+            self._zip_start = self._zip_end = 0
+            raise
+
+        start = self._zip_start
+        self._zip_start += packet_len
+        if self._zip_start == self._zip_end:
+            self._zip_start = self._zip_end = 0
+        return self._zip_view[start:start + packet_len]
+
+    def recv_compressed(self):
+        """Receive compressed packets from the MySQL server"""
+        packet = self.recv_view_compressed()
+        if packet is None:
+            return None
+        return bytearray(packet)
 
     def set_connection_timeout(self, timeout):
         """Set the connection timeout"""
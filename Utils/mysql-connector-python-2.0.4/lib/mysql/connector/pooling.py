@@ -290,40 +290,48 @@ class MySQLConnectionPool(object):
 
             self._queue_connection(cnx)
 
-    def get_connection(self):
+    def get_connection(self, timeout=None):
         """Get a connection from the pool
 
         This method returns an PooledMySQLConnection instance which
         has a reference to the pool that created it, and the next available
         MySQL connection.
 
+        When the pool is exhausted and timeout is given, it waits up to
+        timeout seconds for a connection to be returned to the pool.
+
         When the MySQL connection is not connect, a reconnect is attempted.
 
         Raises PoolError on errors.
 
         Returns a PooledMySQLConnection instance.
         """
-        with CONNECTION_POOL_LOCK:
-            try:
+        try:
+            # wait outside the lock, returning a connection needs it
+            if timeout:
+                cnx = self._cnx_queue.get(block=True, timeout=timeout)
+            else:
                 cnx = self._cnx_queue.get(block=False)
-            except queue.Empty:
-                raise errors.PoolError(
-                    "Failed getting connection; pool exhausted")
-
-            # pylint: disable=W0201,W0212
-            if not cnx.is_connected() \
-                    or self._config_version != cnx._pool_config_version:
-                cnx.config(**self._cnx_config)
-                try:
-                    cnx.reconnect()
-                except errors.InterfaceError:
-                    # Failed to reconnect, give connection back to pool
-                    self._queue_connection(cnx)
-                    raise
-                cnx._pool_config_version = self._config_version
-            # pylint: enable=W0201,W0212
-
-            return PooledMySQLConnection(self, cnx)
+        except queue.Empty:
+            raise errors.PoolError(
+                "Failed getting connection; pool exhausted")
+
+        # The connection is not shared anymore, it is checked without the
+        # lock so that other threads can get connections meanwhile.
+        # pylint: disable=W0201,W0212
+        if not cnx.is_connected() \
+                or self._config_version != cnx._pool_config_version:
+            cnx.config(**self._cnx_config)
+            try:
+                cnx.reconnect()
+            except errors.InterfaceError:
+                # Failed to reconnect, give connection back to pool
+                self._queue_connection(cnx)
+                raise
+            cnx._pool_config_version = self._config_version
+        # pylint: enable=W0201,W0212
+
+        return PooledMySQLConnection(self, cnx)
 
     def _remove_connections(self):
         """Close all connections
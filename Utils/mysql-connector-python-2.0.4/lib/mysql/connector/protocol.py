@@ -308,13 +308,8 @@ class MySQLProtocol(object):
                 break
             packet = sock.recv()
             if packet.startswith(b'\xff\xff\xff'):
-                datas = [packet[4:]]
-                packet = sock.recv()
-                while packet.startswith(b'\xff\xff\xff'):
-                    datas.append(packet[4:])
-                    packet = sock.recv()
-                datas.append(packet[4:])
-                rowdata = utils.read_lc_string_list(bytearray(b'').join(datas))
+                rowdata = utils.read_lc_string_list(
+                    self._read_split_payload(sock, packet))
             elif packet[4] == 254:
                 eof = self.parse_eof(packet)
                 rowdata = None
@@ -326,6 +321,52 @@ class MySQLProtocol(object):
             i += 1
         return (rows, eof)
 
+    def _read_split_payload(self, sock, packet):
+        """Read the rest of a payload which is split over several packets
+
+        The packet argument is the first packet of the payload. The
+        payloads of the following packets are appended to a single buffer,
+        each byte is copied only once.
+
+        Returns a bytearray.
+        """
+        recv = getattr(sock, 'recv_view', sock.recv)
+        payload = bytearray(packet[4:])
+        packet = recv()
+        while packet[0:3] == b'\xff\xff\xff':
+            payload += packet[4:]
+            packet = recv()
+        payload += packet[4:]
+        return payload
+
+    def read_text_result_columns(self, sock, column_count, count=None):
+        """Read MySQL text result column by column
+
+        Reads all or given number of rows from the socket. Unlike
+        read_text_result(), the values are stored in one list per column
+        and no tuple is created for each row.
+
+        Returns a tuple with 2 elements: a list with one list of values
+        per column and the EOF packet.
+        """
+        columns = [[] for _ in range(column_count)]
+        eof = None
+        i = 0
+        # rows are copied out of the packets right away, hence the packets
+        # don't need to be copied out of the socket's receive buffer
+        recv = getattr(sock, 'recv_view', sock.recv)
+        while eof is None and i != count:
+            packet = recv()
+            if packet[0:3] == b'\xff\xff\xff':
+                utils.read_lc_string_columns(
+                    self._read_split_payload(sock, packet), columns)
+            elif packet[4] == 254:
+                eof = self.parse_eof(packet)
+            else:
+                utils.read_lc_string_columns(packet[4:], columns)
+            i += 1
+        return (columns, eof)
+
     def _parse_binary_integer(self, packet, field):
         """Parse an integer from a binary packet"""
         if field[1] == FieldType.TINY:
@@ -431,6 +472,58 @@ class MySQLProtocol(object):
 
         return tuple(values)
 
+    def _parse_binary_values_columns(self, fields, packet, columns):
+        """Parse values from a binary result packet into columns
+
+        Works like _parse_binary_values(), but each value is appended to
+        the list at the same position in columns instead of creating a
+        tuple for the row.
+        """
+        null_bitmap_length = (len(fields) + 7 + 2) // 8
+        null_bitmap = packet[0:null_bitmap_length]
+        packet = packet[null_bitmap_length:]
+
+        for pos, (field, column) in enumerate(zip(fields, columns)):
+            if null_bitmap[(pos + 2) // 8] & (1 << (pos + 2) % 8):
+                column.append(None)
+                continue
+            elif field[1] in (FieldType.TINY, FieldType.SHORT,
+                              FieldType.INT24,
+                              FieldType.LONG, FieldType.LONGLONG):
+                (packet, value) = self._parse_binary_integer(packet, field)
+            elif field[1] in (FieldType.DOUBLE, FieldType.FLOAT):
+                (packet, value) = self._parse_binary_float(packet, field)
+            elif field[1] in (FieldType.DATETIME, FieldType.DATE,
+                              FieldType.TIMESTAMP):
+                (packet, value) = self._parse_binary_timestamp(packet, field)
+            elif field[1] == FieldType.TIME:
+                (packet, value) = self._parse_binary_time(packet, field)
+            else:
+                (packet, value) = utils.read_lc_string(packet)
+            column.append(value)
+
+    def read_binary_result_columns(self, sock, fields, count=None):
+        """Read MySQL binary protocol result column by column
+
+        Reads all or given number of binary resultset rows from the socket.
+        Unlike read_binary_result(), the values are stored in one list per
+        column and no tuple is created for each row.
+
+        Returns a tuple with 2 elements: a list with one list of values
+        per column and the EOF packet.
+        """
+        columns = [[] for _ in fields]
+        eof = None
+        i = 0
+        while eof is None and i != count:
+            packet = sock.recv()
+            if packet[4] == 254:
+                eof = self.parse_eof(packet)
+            elif packet[4] == 0:
+                self._parse_binary_values_columns(fields, packet[5:], columns)
+            i += 1
+        return (columns, eof)
+
     def read_binary_result(self, sock, columns, count=1):
         """Read MySQL binary protocol result
 
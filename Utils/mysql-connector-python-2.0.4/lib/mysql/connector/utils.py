@@ -258,6 +258,41 @@ def read_lc_string_list(buf):
     return tuple(byteslst)
 
 
+def read_lc_string_columns(buf, columns):
+    """Reads all length encoded strings from the given buffer into columns
+
+    The buffer holds one row of a text result. Each value is appended to
+    the list at the same position in columns, so no intermediate row
+    tuple is created.
+
+    Returns True, or False when the buffer holds an error instead of a row.
+    """
+    buf = bytes(buf)
+    if not buf or buf[0] == 255:
+        # Special case when MySQL error 1317 is returned by MySQL.
+        return False
+
+    sizes = {252: 2, 253: 3, 254: 8}
+
+    pos = 0
+    for column in columns:
+        first = buf[pos]
+        if first == 251:
+            # NULL value
+            column.append(None)
+            pos += 1
+        elif first <= 250:
+            column.append(buf[(pos + 1):first + (pos + 1)])
+            pos += 1 + first
+        else:
+            lsize = sizes[first]
+            length = intread(buf[(pos + 1):lsize + (pos + 1)])
+            column.append(buf[pos + 1 + lsize:length + lsize + (pos + 1)])
+            pos += 1 + lsize + length
+
+    return True
+
+
 def read_string(buf, end=None, size=None):
     """
     Reads a string up until a character or for a given size.
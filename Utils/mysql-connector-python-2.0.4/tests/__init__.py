@@ -156,12 +156,14 @@ class DummySocket(object):
             raise socket.error(self._raise_socket_error)
         if nbytes == 0:
             nbytes = len(buffer)
+        # like socket.recv_into(), return what is available up to nbytes
+        nbytes = min(nbytes, len(self._server_replies))
         try:
             buffer[0:nbytes] = self._server_replies[0:nbytes]
         except (IndexError, TypeError, ValueError) as err:
             return 0
         self._server_replies = self._server_replies[nbytes:]
-        return len(buffer)
+        return nbytes
 
     def send(self, string, flags=0):
         if self._raise_socket_error:
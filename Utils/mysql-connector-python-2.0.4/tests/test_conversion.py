@@ -29,9 +29,10 @@ from decimal import Decimal
 import datetime
 import time
 import uuid
+import unittest
 
 import tests
-from mysql.connector import conversion, constants
+from mysql.connector import conversion, constants, errors
 from mysql.connector.catch23 import PY2
 
 
@@ -327,6 +328,128 @@ class MySQLConverterTests(tests.MySQLConnectorTests):
         res = self.cnv.row_to_python(data, description)
         self.assertEqual(res, self._to_python_exp)
 
+    def test_conversion_plan(self):
+        """Compile conversion plan once per result set"""
+        field_type = constants.FieldType
+        description = [('i', field_type.LONG), ('f', field_type.DOUBLE)]
+        plan = self.cnv.conversion_plan(description)
+        self.assertEqual(((int, float), True), plan)
+        self.assertTrue(plan is self.cnv.conversion_plan(description))
+
+        description.append(('s', field_type.VAR_STRING))
+        self.assertFalse(self.cnv.conversion_plan(list(description))[1])
+
+        class IntConverter(conversion.MySQLConverter):
+            """Converter returning integers as str"""
+            def _LONG_to_python(self, value, desc=None):
+                return str(int(value))
+
+        plan = IntConverter().conversion_plan(description[:1])
+        self.assertFalse(plan[1])
+        self.assertEqual('12', plan[0][0](b'12'))
+
+    def test_rows_to_python(self):
+        """Convert many MySQL text result rows at once"""
+        data = [v[0] for v in self._to_python_data]
+        description = [v[1] for v in self._to_python_data]
+
+        res = self.cnv.rows_to_python([data, data], description)
+        self.assertEqual([self._to_python_exp]*2, res)
+
+        field_type = constants.FieldType
+        description = [('i', field_type.LONG), ('f', field_type.DOUBLE)]
+        rows = [(b'1', b'2.5'), (None, b'3'), (b'4', None)]
+        exp = [(1, 2.5), (None, 3.0), (4, None)]
+        self.assertEqual(exp, self.cnv.rows_to_python(rows, description))
+        self.assertEqual([], self.cnv.rows_to_python([], description))
+
+        try:
+            self.cnv.rows_to_python([(b'1', b'x')], description)
+        except ValueError as err:
+            self.assertTrue(err.message.endswith('(field f)'))
+        else:
+            self.fail("ValueError not raised")
+
+    @unittest.skipIf(conversion.numpy is None, "NumPy not available")
+    def test_column_to_numpy(self):
+        """Convert MySQL text result columns to NumPy arrays"""
+        numpy = conversion.numpy
+        field_type = constants.FieldType
+        unsigned = constants.FieldFlag.UNSIGNED
+        cases = [
+            ([b'3.14', None, b'-1e-09'], ('f', field_type.DOUBLE),
+             numpy.array([3.14, numpy.nan, -1e-09])),
+            ([b'3.14', b'2'], ('d', field_type.NEWDECIMAL),
+             numpy.array([3.14, 2.0])),
+            ([b'128', b'-5'], ('i', field_type.LONG),
+             numpy.array([128, -5], dtype=numpy.int64)),
+            ([b'128', None], ('i', field_type.LONG),
+             numpy.array([128, numpy.nan])),
+            ([b'18446744073709551615'],
+             ('u', field_type.LONGLONG, None, None, None, None, True,
+              unsigned),
+             numpy.array([18446744073709551615], dtype=numpy.uint64)),
+            ([b'2008-05-07 22:34:10', b'2008-05-07 22:34:10.5', None],
+             ('dt', field_type.DATETIME),
+             numpy.array(['2008-05-07T22:34:10', '2008-05-07T22:34:10.5',
+                          'NaT'], dtype='datetime64[us]')),
+            ([b'2008-05-07', b'0000-00-00'], ('d', field_type.DATE),
+             numpy.array(['2008-05-07', 'NaT'], dtype='datetime64[D]')),
+            ([], ('f', field_type.FLOAT), numpy.array([])),
+        ]
+        for values, field, exp in cases:
+            res = self.cnv.column_to_numpy(values, field)
+            self.assertEqual(exp.dtype, res.dtype)
+            numpy.testing.assert_array_equal(exp, res)
+
+        res = self.cnv.column_to_numpy(
+            [b'\xc3\xa4 utf8 string', None],
+            ('s', field_type.STRING, None, None, None, None, True, 0))
+        self.assertEqual(object, res.dtype)
+        self.assertEqual([self._to_python_exp[-1], None], res.tolist())
+
+    @unittest.skipIf(conversion.numpy is None, "NumPy not available")
+    def test_binary_column_to_numpy(self):
+        """Convert MySQL binary result columns to NumPy arrays"""
+        numpy = conversion.numpy
+        field_type = constants.FieldType
+        cases = [
+            ([3.14, None], ('f', field_type.DOUBLE),
+             numpy.array([3.14, numpy.nan])),
+            ([bytearray(b'3.14'), None], ('d', field_type.NEWDECIMAL),
+             numpy.array([3.14, numpy.nan])),
+            ([128, -5], ('i', field_type.LONG),
+             numpy.array([128, -5], dtype=numpy.int64)),
+            ([128, None], ('i', field_type.TINY),
+             numpy.array([128, numpy.nan])),
+            ([datetime.datetime(2008, 5, 7, 22, 34, 10), None],
+             ('dt', field_type.DATETIME),
+             numpy.array(['2008-05-07T22:34:10', 'NaT'],
+                         dtype='datetime64[us]')),
+            ([datetime.date(2008, 5, 7)], ('d', field_type.DATE),
+             numpy.array(['2008-05-07'], dtype='datetime64[D]')),
+        ]
+        for values, field, exp in cases:
+            res = self.cnv.binary_column_to_numpy(values, field)
+            self.assertEqual(exp.dtype, res.dtype)
+            numpy.testing.assert_array_equal(exp, res)
+
+        res = self.cnv.binary_column_to_numpy(
+            [bytearray(b'\xc3\xa4 utf8 string'), None],
+            ('s', field_type.STRING, None, None, None, None, True, 0))
+        self.assertEqual([self._to_python_exp[-1], None], res.tolist())
+
+    def test_column_to_numpy_unavailable(self):
+        """Converting columns without NumPy raises InterfaceError"""
+        numpy = conversion.numpy
+        conversion.numpy = None
+        try:
+            self.assertRaises(errors.InterfaceError,
+                              self.cnv.column_to_numpy,
+                              [b'1'], ('i', constants.FieldType.LONG))
+        finally:
+            conversion.numpy = numpy
+
     def test__FLOAT_to_python(self):
         """Convert a MySQL FLOAT/DOUBLE to a Python float type"""
         data = b'3.14'
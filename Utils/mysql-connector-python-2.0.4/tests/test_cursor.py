@@ -38,10 +38,11 @@ from collections import namedtuple
 from decimal import Decimal
 import re
 import time
+import unittest
 
 from . import PY2
 import tests
-from mysql.connector import (connection, cursor, errors)
+from mysql.connector import (connection, conversion, cursor, errors)
 
 
 class CursorModule(tests.MySQLConnectorTests):
@@ -1418,3 +1419,27 @@ class MySQLCursorBufferedNamedTupleTests(tests.TestsCursor):
         self.assertEqual(exp.id, row[0].id)
         self.assertEqual(exp.name, row[0].name)
         self.assertEqual(exp.city, row[0].city)
+
+
+class MySQLCursorNumPyTests(tests.MySQLConnectorTests):
+
+    def setUp(self):
+        self.cur = cursor.MySQLCursorNumPy(connection=None)
+        self.cur._connection = namedtuple('Connection', ['converter'])(
+            conversion.MySQLConverter())
+        # SELECT a.id, b.id, b.id_1, b.id
+        self.cur._description = [
+            (name, 3, None, None, None, None, 0, 1)
+            for name in ('id', 'id', 'id_1', 'id')]
+
+    def test__column_keys(self):
+        self.assertEqual(['id', 'id_1', 'id_1_1', 'id_2'],
+                         self.cur._column_keys())
+
+    @unittest.skipIf(conversion.numpy is None, "NumPy not available")
+    def test__columns_to_numpy(self):
+        columns = [[b'1'], [b'2'], [b'3'], [b'4']]
+        result = self.cur._columns_to_numpy(columns)
+        self.assertEqual(['id', 'id_1', 'id_1_1', 'id_2'], list(result))
+        self.assertEqual([1, 2, 3, 4],
+                         [int(array[0]) for array in result.values()])
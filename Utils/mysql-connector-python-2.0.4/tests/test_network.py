@@ -228,6 +228,30 @@ class BaseMySQLSocketTests(tests.MySQLConnectorTests):
             packet = self.cnx.recv_plain()
         self.assertEqual(exp, result)
 
+    def test_recv_view_plain(self):
+        """Receive packets as views on the receive buffer"""
+        self.cnx.sock = tests.DummySocket()
+        self.cnx.get_address = lambda: 'dummy'
+
+        exp = [
+            b'\x04\x00\x00\x04\x03\x48\x61\x6d',
+            b'\x05\x00\x00\x05\xfe\x00\x00\x02\x00',
+        ]
+        # larger than the receive buffer
+        payload = b'\xfa' * (network.RECV_BUFFER_SIZE + 10)
+        exp.append(
+            network.struct.pack('<I', len(payload))[0:3] + b'\x06' + payload)
+        exp.append(b'\x01\x00\x00\x07\x01')
+        self.cnx.sock.add_packets(exp)
+
+        result = []
+        for _ in exp:
+            packet = self.cnx.recv_view_plain()
+            self.assertTrue(isinstance(packet, memoryview))
+            result.append(packet.tobytes())
+        self.assertEqual(exp, result)
+        self.assertEqual(7, self.cnx._packet_number)
+
     def test_recv_compressed(self):
         """Receive compressed data from the socket"""
         self.cnx.sock = tests.DummySocket()
@@ -286,6 +310,47 @@ class BaseMySQLSocketTests(tests.MySQLConnectorTests):
             packet = self.cnx.recv_compressed()
             counter += 1
 
+    def test_recv_view_compressed(self):
+        """Receive packets spanning several compressed packets"""
+        self.cnx.sock = tests.DummySocket()
+        self.cnx.get_address = lambda: 'dummy'
+
+        exp = [
+            b'\x04\x00\x00\x01\x03\x48\x61\x6d',
+            b'\x05\x00\x00\x02\xfe\x00\x00\x02\x00',
+        ]
+        payload = b'\xfa' * (network.RECV_BUFFER_SIZE + 10)
+        exp.append(
+            network.struct.pack('<I', len(payload))[0:3] + b'\x03' + payload)
+        exp.append(b'\x01\x00\x00\x04\x01')
+        stream = b''.join(exp)
+
+        # compressed packets of 16KB, the last one sent uncompressed
+        seqid = 0
+        while len(stream) > 16384:
+            zbuf = network.zlib.compress(stream[:16384])
+            self.cnx.sock.add_packet(
+                network.struct.pack('<I', len(zbuf))[0:3]
+                + network.struct.pack('<B', seqid) + b'\x00\x40\x00' + zbuf)
+            stream = stream[16384:]
+            seqid += 1
+        self.cnx.sock.add_packet(
+            network.struct.pack('<I', len(stream))[0:3]
+            + network.struct.pack('<B', seqid) + b'\x00\x00\x00' + stream)
+
+        result = []
+        for _ in exp:
+            packet = self.cnx.recv_view_compressed()
+            self.assertTrue(isinstance(packet, memoryview))
+            result.append(packet.tobytes())
+        self.assertEqual(exp, result)
+        self.assertEqual(None, self.cnx.recv_view_compressed())
+
+        # payload which does not decompress to the announced length
+        self.cnx.sock.add_packet(b'\x05\x00\x00\x00\x10\x00\x00hello')
+        self.assertRaises(errors.InterfaceError,
+                          self.cnx.recv_view_compressed)
+
     def test_set_connection_timeout(self):
         """Set the connection timeout"""
         exp = 5
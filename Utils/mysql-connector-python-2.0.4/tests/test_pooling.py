@@ -24,6 +24,8 @@
 """Unittests for mysql.connector.pooling
 """
 
+import threading
+import time
 import uuid
 try:
     from Queue import Queue
@@ -306,6 +308,24 @@ class MySQLConnectionPoolTests(tests.MySQLConnectorTests):
         self.assertEqual(1, pcnx.autocommit)
         pcnx.close()
 
+    def test_get_connection_timeout(self):
+        dbconfig = tests.get_mysql_config()
+        cnxpool = pooling.MySQLConnectionPool(pool_size=1, **dbconfig)
+        pcnx = cnxpool.get_connection()
+
+        # Wait for a connection, but none is returned
+        start = time.time()
+        self.assertRaises(errors.PoolError, cnxpool.get_connection, 0.2)
+        self.assertTrue(time.time() - start >= 0.2)
+
+        # Wait for a connection returned by another thread
+        timer = threading.Timer(0.2, pcnx.close)
+        timer.start()
+        pcnx = cnxpool.get_connection(timeout=5)
+        timer.join()
+        self.assertTrue(isinstance(pcnx, pooling.PooledMySQLConnection))
+        pcnx.close()
+
     def test__remove_connections(self):
         dbconfig = tests.get_mysql_config()
         cnxpool = pooling.MySQLConnectionPool(
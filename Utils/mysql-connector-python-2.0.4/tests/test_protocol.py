@@ -413,6 +413,20 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
         res = self._protocol._parse_binary_values(fields, packet)
         self.assertEqual(exp, res)
 
+    def test__parse_binary_values_columns(self):
+        """Parse values from a binary result packet into columns"""
+        fields = [('aStr', 253, None, None, None, None, 0, 1),
+                  ('aDate', 10, None, None, None, None, 1, 128),
+                  ('aNull', 6, None, None, None, None, 1, 128)]
+        packet = bytearray(b'\x10\x03\x61\x62\x63\x04\xd3\x07\x01\x1f')
+
+        columns = [[bytearray(b'x')], [None], [None]]
+        self._protocol._parse_binary_values_columns(fields, packet, columns)
+        exp = [[bytearray(b'x'), bytearray(b'abc')],
+               [None, datetime.date(2003, 1, 31)],
+               [None, None]]
+        self.assertEqual(exp, columns)
+
     def test_read_binary_result(self):
         """Read MySQL binary protocol result"""
 
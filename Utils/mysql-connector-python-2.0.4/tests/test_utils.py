@@ -204,6 +204,22 @@ class UtilsTests(tests.MySQLConnectorTests):
         if result != None or rest != exp:
             self.fail("Wrong result. Expected None.")
 
+    def test_read_lc_string_columns(self):
+        """Read length coded strings of a row into column lists"""
+        buf = (bytearray(b'\x03abc') + bytearray(b'\xfb') +
+               bytearray(b'\xfc') + utils.int2store(300) +
+               bytearray(b'a' * 300))
+        columns = [[], [], []]
+        self.assertTrue(utils.read_lc_string_columns(buf, columns))
+        self.assertTrue(utils.read_lc_string_columns(b'\x01d\x00\x01e',
+                                                     columns))
+        self.assertEqual([[b'abc', b'd'], [None, b''], [b'a' * 300, b'e']],
+                         columns)
+
+        columns = [[]]
+        self.assertFalse(utils.read_lc_string_columns(b'\xff\x01', columns))
+        self.assertEqual([[]], columns)
+
     def test_read_string_1(self):
         """Read a string from a buffer up until a certain character."""
         buf = bytearray(b'abcdef\x00ghijklm')
@@ -6,6 +6,7 @@ BENIS
 
 from .KITConfig.kitconfig import KITConfig
 from .kitdata import KITData
-from .kitplot import KITPlot
+from .kitplot import KITPlot, render_many
+from .kitcache import KITCache, KITMemo
 from .KITSearch.kitsearch import KITSearch
 from .KITSearch.kitnewsearch import KITNewSearch
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+#pylint: disable=C0103
+"""Persistent cache for measurements fetched from the ETP databases"""
+import os
+import io
+import sys
+import json
+import time
+import logging
+import datetime
+import threading
+from decimal import Decimal
+from collections import OrderedDict
+import numpy as np
+
+class KITCache(object):
+    """Stores measurements that were fetched from one of the databases as
+    compressed .npz files in a local folder, so that the same PID doesn't
+    need to be downloaded again every time a plot is redrawn. Entries are
+    keyed by database backend ('new'|'old') and PID.
+
+    Args:
+        - directory (str): folder where the cache files are stored. By
+                           default the 'KITPlot' folder in the user's cache
+                           directory (see 'default_directory')
+        - ttl (float): entries older than this many seconds are refetched
+        - max_size (int): maximum size of the cache folder in bytes. The
+                          least recently used entries are deleted first.
+        - refresh (bool): ignore cached entries and overwrite them with
+                          freshly fetched data
+    """
+
+    # data columns of the dicts returned by the database backends
+    columns = ("dataX", "dataY", "dataZ", "temp", "rh", "err", "bias_cur",
+               "time")
+
+    def __init__(self, directory=None, ttl=7*24*3600,
+                 max_size=500*1024**2, refresh=False):
+
+        self.log = logging.getLogger(__class__.__name__)
+        self.log.setLevel(logging.DEBUG)
+        if self.log.hasHandlers() is False:
+            format_string = '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+            formatter = logging.Formatter(format_string)
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(formatter)
+            self.log.addHandler(console_handler)
+
+        if directory is None:
+            directory = default_directory()
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.ttl = ttl
+        self.max_size = max_size
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, backend, pid):
+        """Returns the cached measurement dict or None if there is no valid
+        entry for this PID"""
+        path = self.__path(backend, pid)
+        if self.refresh is True or not os.path.isfile(path):
+            self.misses += 1
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                meta = json.loads(str(npz["meta"]), object_hook=decode_meta)
+                age = time.time() - meta.pop("cached")
+                if age > self.ttl:
+                    self.log.debug("Cache entry for %s PID %s expired",
+                                   backend, pid)
+                    self.misses += 1
+                    return None
+                data = {col: npz[col] for col in KITCache.columns}
+        except (OSError, ValueError, KeyError) as err:
+            self.log.warning("Corrupt cache entry %s (%s)", path, err)
+            self.misses += 1
+            return None
+        data.update(meta)
+        # mark entry as recently used
+        os.utime(path)
+        self.hits += 1
+        self.log.info("Using cached measurement of %s PID %s (%.1f h old)",
+                      backend, pid, age/3600)
+        return data
+
+    def put(self, backend, pid, data):
+        """Stores a measurement dict as returned by 'probe_search_data' or
+        'extract_data' in the cache. Measurements with data columns that
+        can't be stored as plain arrays (e.g. numbers mixed with strings)
+        are skipped.
+
+        Returns:
+            True if the measurement was stored, False otherwise
+
+        """
+        arrays = {col: np.asarray(data[col]) for col in KITCache.columns}
+        # object arrays would be pickled and can't be loaded by 'get'
+        mixed = [col for col, arr in arrays.items() if arr.dtype == object]
+        if mixed != []:
+            self.log.debug("Not caching %s PID %s, mixed values in %s",
+                           backend, pid, ", ".join(mixed))
+            return False
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        meta = {key: val for key, val in data.items()
+                if key not in KITCache.columns}
+        meta["cached"] = time.time()
+        arrays["meta"] = np.array(json.dumps(meta, default=encode_meta))
+        # write to memory first so that no half written file is left behind
+        buf = io.BytesIO()
+        np.savez_compressed(buf, **arrays)
+        tmp_path = self.__path(backend, pid) + ".tmp"
+        with open(tmp_path, "wb") as stream:
+            stream.write(buf.getvalue())
+        os.replace(tmp_path, self.__path(backend, pid))
+        self.evict()
+        return True
+
+    def invalidate(self, backend=None, pid=None):
+        """Deletes the entries of a single PID or, if no PID is given, all
+        entries (of one backend). Without backend the PID is deleted for
+        all backends."""
+        for path in self.__entries():
+            name = os.path.basename(path)
+            if backend is not None and not name.startswith(backend + "_"):
+                continue
+            if pid is not None and not name.endswith("_{}.npz".format(pid)):
+                continue
+            os.remove(path)
+        return True
+
+    def evict(self):
+        """Deletes least recently used entries until the cache folder is
+        smaller than 'max_size'"""
+        entries = [(os.stat(path), path) for path in self.__entries()]
+        total = sum(stat.st_size for stat, _ in entries)
+        for stat, path in sorted(entries, key=lambda entry: entry[0].st_mtime):
+            if total <= self.max_size:
+                break
+            os.remove(path)
+            total -= stat.st_size
+            self.log.debug("Evicted %s from cache", os.path.basename(path))
+        return True
+
+    def stats(self):
+        """Returns number of hits, misses and cached entries"""
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self.__entries())}
+
+    def __entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return [os.path.join(self.directory, name)
+                for name in os.listdir(self.directory)
+                if name.endswith(".npz")]
+
+    def __path(self, backend, pid):
+        return os.path.join(self.directory, "{}_{}.npz".format(backend, pid))
+
+
+class KITMemo(object):
+    """Process wide in-memory LRU store for decoded measurements. Every
+    KITData object consults it before the cache folder or the database is
+    touched, so the same PID is only fetched once per session even if it is
+    used by several KITPlot objects.
+
+    Args:
+        - capacity (int): maximum size of all stored measurements in bytes.
+                          The least recently used entries are dropped first.
+    """
+
+    def __init__(self, capacity=256*1024**2):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+
+    def get(self, backend, pid):
+        """Returns a copy of the stored measurement dict or None"""
+        with self.__lock:
+            try:
+                data, _ = self.__entries[(backend, pid)]
+            except KeyError:
+                self.misses += 1
+                return None
+            self.__entries.move_to_end((backend, pid))
+            self.hits += 1
+        # hand out copies so that stored arrays can't be altered by accident
+        return {key: val.copy() if isinstance(val, np.ndarray) else val
+                for key, val in data.items()}
+
+    def put(self, backend, pid, data):
+        """Stores a measurement dict whose data columns are numpy arrays"""
+        size = measure(data)
+        with self.__lock:
+            if (backend, pid) in self.__entries:
+                self.__size -= self.__entries.pop((backend, pid))[1]
+            if size > self.capacity:
+                return False
+            self.__entries[(backend, pid)] = (
+                {key: val.copy() if isinstance(val, np.ndarray) else val
+                 for key, val in data.items()}, size)
+            self.__size += size
+            while self.__size > self.capacity:
+                _, (_, dropped) = self.__entries.popitem(last=False)
+                self.__size -= dropped
+        return True
+
+    def resize(self, capacity):
+        """Changes the capacity and drops entries if necessary"""
+        with self.__lock:
+            self.capacity = capacity
+            while self.__size > self.capacity:
+                _, (_, dropped) = self.__entries.popitem(last=False)
+                self.__size -= dropped
+        return True
+
+    def clear(self):
+        """Drops all stored measurements"""
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+        return True
+
+    def info(self):
+        """Returns number of hits, misses, stored entries and their size"""
+        with self.__lock:
+            return {"hits": self.hits,
+                    "misses": self.misses,
+                    "entries": len(self.__entries),
+                    "keys": list(self.__entries.keys()),
+                    "size": self.__size,
+                    "capacity": self.capacity}
+
+
+def default_directory():
+    """Returns the cache folder in the user's cache directory, i.e.
+    %LOCALAPPDATA%\\KITPlot on Windows and $XDG_CACHE_HOME/KITPlot or
+    ~/.cache/KITPlot otherwise"""
+    if os.name == "nt" and os.environ.get("LOCALAPPDATA"):
+        base = os.environ["LOCALAPPDATA"]
+    else:
+        base = os.environ.get("XDG_CACHE_HOME",
+                              os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "KITPlot")
+
+
+def encode_meta(value):
+    """JSON encoder for meta values that JSON can't represent. Dates and
+    decimals are tagged with their type, so that 'decode_meta' restores
+    them on a cache hit."""
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"__decimal__": str(value)}
+    raise TypeError("Can't cache meta value of type {}"
+                    .format(type(value).__name__))
+
+
+def decode_meta(obj):
+    """JSON object hook that restores the values tagged by 'encode_meta'"""
+    if "__datetime__" in obj:
+        return datetime.datetime.fromisoformat(obj["__datetime__"])
+    if "__date__" in obj:
+        return datetime.date.fromisoformat(obj["__date__"])
+    if "__decimal__" in obj:
+        return Decimal(obj["__decimal__"])
+    return obj
+
+
+def measure(data):
+    """Estimates the memory footprint of a measurement dict in bytes"""
+    size = sys.getsizeof(data)
+    for val in data.values():
+        if isinstance(val, np.ndarray):
+            size += val.nbytes
+        else:
+            size += sys.getsizeof(val)
+    return size
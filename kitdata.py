@@ -1,7 +1,5 @@
 #!/usr/bin/env python3
 import os
-import sys
-import datetime
 import logging
 import numpy as np
 import yaml
@@ -9,7 +7,7 @@ import pandas as pd
 from .KITConfig import KITConfig
 from .KITSearch import KITSearch
 from .KITSearch import KITNewSearch
-from collections import OrderedDict
+from .kitcache import KITCache, KITMemo
 
 class KITData(object):
     """ The KITData class is a very simple data container that is able
@@ -19,9 +17,17 @@ class KITData(object):
     """
 
     dbSession = None
+    # process wide memory of fetched measurements that is consulted before
+    # the cache folder and the database
+    memo = KITMemo()
+
+    # names of all data columns that are stored point by point
+    columns = ("x", "y", "z", "dx", "dy", "dz", "temp", "humid", "err",
+               "bias_current", "time")
 
     def __init__(self, dataInput=None, measurement="probe",
-                 credentials='db.cfg', show_input=None, new_db=True):
+                 credentials='db.cfg', show_input=None, new_db=True,
+                 chunksize=None, cache=None):
         """ Initialize KITData object based on the input that is passed.
 
         Args:
@@ -31,6 +37,12 @@ class KITData(object):
                 station or alibava measurement
             credentials (str): Specify the credentials file for the database if
                 the file is not located in the current working directory
+            chunksize (None|int): Parse file inputs in chunks of this many
+                lines and read measurements from the old database in chunks
+                of this many rows in order to limit the memory footprint of
+                huge measurements
+            cache (None|KITCache): cache folder for measurements that were
+                fetched from the database
         """
         self.log = logging.getLogger(__class__.__name__)
         self.log.setLevel(logging.DEBUG)
@@ -44,19 +56,8 @@ class KITData(object):
         self.__id = None
         self.__name = None
 
-        self.__x = []
-        self.__y = []
-        self.__z = []
-
-        self.__dx = []
-        self.__dy = []
-        self.__dz = []
-
-        self.__temp = []
-        self.__humid = []
-        self.__err = []
-        self.__bias_current = []
-        self.__time = []
+        # columnar storage: one contiguous numpy array per data column
+        self.__data = {col: np.empty(0) for col in KITData.columns}
 
         self.__px = None
         self.__py = None
@@ -67,6 +68,7 @@ class KITData(object):
 
         self.__RPunchDict = None
         self.__credentials = credentials
+        self.__cache = cache
 
         # ALiBaVa specific
         self.__gain = None
@@ -87,9 +89,6 @@ class KITData(object):
         # A single PID for either a probe station or ALiBaVa measurement
         elif isinstance(dataInput, int):
             self.__id = dataInput
-            # Establish database connection if its no already established
-            if KITData.dbSession is None:
-                self.__init_db_connection(credentials, new_db=new_db)
 
             # Distinguish between probe station and ALiBaVa ID
             if measurement == "alibava":
@@ -97,13 +96,16 @@ class KITData(object):
                     self.log.info("Input: ALiBaVa run")
                 else:
                     pass
+                # Establish database connection if its no already established
+                if KITData.dbSession is None:
+                    self.__init_db_connection(credentials, new_db=new_db)
                 self.__allo_db_alibava(dataInput, new_db)
             elif measurement == "probe" and show_input is not False:
                 if show_input is not False:
                     self.log.info("Input: Probe station PID")
                 else:
                     pass
-                self.__allo_db(dataInput, new_db)
+                self.__allo_db(dataInput, new_db, chunksize)
 
 
 
@@ -112,39 +114,18 @@ class KITData(object):
 
             self.log.info("Input: File: %s", dataInput)
 
-            with open(dataInput, 'r') as inputFile:
-                for line in inputFile:
-                    if "," in line:
-                        splited = line.split(",")
-                    else:
-                        splited = line.split()
-                    try:
-                        # First two columns are always interpreted as x and y
-                        self.__x.append(float(splited[0]))
-                        self.__y.append(float(splited[1]))
-                        # Three columns are seen as x,y,z
-                        if len(splited) == 3:
-                            self.__z.append(float(splited[2]))
-                        # Four columns represent x,y and their errors dx,dy
-                        elif len(splited) == 4:
-                            self.__dx.append(float(splited[2]))
-                            self.__dy.append(float(splited[3]))
-                        # Six column are seen as x,y,z and their errors dx,dy,dz
-                        elif len(splited) == 6:
-                            self.__z.append(float(splited[2]))
-                            self.__dx.append(float(splited[3]))
-                            self.__dy.append(float(splited[4]))
-                            self.__dz.append(float(splited[5]))
-                    except:
-                        pass
-
-                else:
-                    self.__name = os.path.basename(dataInput).split(".")[0]
-                    for char in os.path.basename(dataInput):
-                        if char == "-":
-                            self.__name = os.path.basename(dataInput).split("-")[0]
-                        else:
-                            pass
+            try:
+                cols, n_bad = read_table(dataInput, chunksize=chunksize)
+                if n_bad != 0:
+                    self.log.warning("Skipped %i malformed line(s) in %s",
+                                     n_bad, dataInput)
+                self.__set_columns(**cols)
+            except ValueError as err:
+                self.log.warning("Couldn't read data from %s (%s)",
+                                 dataInput, err)
+            self.__name = os.path.basename(dataInput).split(".")[0]
+            if "-" in os.path.basename(dataInput):
+                self.__name = os.path.basename(dataInput).split("-")[0]
 
 
         # Data input contains list of KITData objects
@@ -158,11 +139,11 @@ class KITData(object):
             self.__name = dataInput[0].getName()
             self.__fluence = dataInput[0].getFluenceP()
 
-            for kitFile in dataInput:
-                self.__x.append(kitFile.getX()[0])
-                self.__y.append(kitFile.getY()[0])
-                self.__z.append(kitFile.getZ()[0])
-                self.__dy.append(kitFile.getdY()[0])
+            self.__set_columns(
+                x=[kitFile.getX(asarray=True)[0] for kitFile in dataInput],
+                y=[kitFile.getY(asarray=True)[0] for kitFile in dataInput],
+                z=[kitFile.getZ(asarray=True)[0] for kitFile in dataInput],
+                dy=[kitFile.getdY(asarray=True)[0] for kitFile in dataInput])
 
 
         # NEW FEATURE: Data input is an array or tuple containing lists or
@@ -171,22 +152,18 @@ class KITData(object):
         and all(isinstance(i, (list, tuple)) for i in dataInput):
             try:
                 # First two columns are always interpreted as x and y
-                self.__x = dataInput[0]
-                self.__y = dataInput[1]
+                self.__set_columns(x=dataInput[0], y=dataInput[1])
 
                 # Three columns are seen as x,y,z
                 if len(dataInput) == 3:
-                    self.__z = dataInput[3]
+                    self.__set_columns(z=dataInput[2])
                 # Four columns represent x,y and their errors dx,dy
                 elif len(dataInput) == 4:
-                    self.__dx = dataInput[2]
-                    self.__dy = dataInput[3]
+                    self.__set_columns(dx=dataInput[2], dy=dataInput[3])
                 # Six column are seen as x,y,z and their errors dx,dy,dz
                 elif len(dataInput) == 6:
-                    self.__z = dataInput[2]
-                    self.__dx = dataInput[3]
-                    self.__dy = dataInput[4]
-                    self.__dz = dataInput[5]
+                    self.__set_columns(z=dataInput[2], dx=dataInput[3],
+                                       dy=dataInput[4], dz=dataInput[5])
                     # # Rpunch measurement from file
                     # elif len(splited) > 6 and "REdge" in dataInput:
                     #     self.__z.append(dataInput[2])
@@ -198,6 +175,65 @@ class KITData(object):
                           %(str(dataInput)))
 
 
+    def __set_columns(self, **kwargs):
+        """Convert each given sequence into a contiguous numpy array and store
+        it as the respective data column.
+
+        Args:
+            kwargs (x=[],y=[],...): column name and its values
+
+        """
+        for key, values in kwargs.items():
+            if key not in KITData.columns:
+                raise KeyError("Unknown data column '{}'".format(key))
+            self.__data[key] = to_column(values)
+
+    @classmethod
+    def from_pids(cls, pid_lst, measurement="probe", credentials='db.cfg',
+                  new_db=True, workers=None, cache=None):
+        """Create KITData objects for several PIDs. Probe station measurements
+        from the new database are fetched concurrently, so the total time is
+        bounded by the slowest request instead of the sum of all requests.
+
+        Args:
+            pid_lst (list): PIDs as integers or digit strings
+            measurement (probe|alibava): type of measurement
+            credentials (str): credentials file for the database
+            new_db (True|False): use the new (REST) or the old (SQL) database
+            workers (None|int): maximum number of simultaneous requests
+                                (None: one per pooled connection)
+            cache (None|KITCache): cache folder for measurements that were
+                                   fetched from the database
+
+        Returns:
+            list of KITData objects in the order of 'pid_lst'
+
+        """
+        pid_lst = [int(pid) for pid in pid_lst]
+        if pid_lst == []:
+            return []
+        if measurement != "probe" or new_db is not True:
+            return [cls(pid, measurement=measurement, credentials=credentials,
+                        new_db=new_db, cache=cache) for pid in pid_lst]
+
+        kdata_lst = [cls(cache=cache) for _ in pid_lst]
+        kdata_lst[0].log.info("Input: %i probe station PIDs", len(pid_lst))
+        data_lst = [kdata.__lookup("new", pid)
+                    for kdata, pid in zip(kdata_lst, pid_lst)]
+        missing = [i for i, data in enumerate(data_lst) if data is None]
+        if missing != []:
+            if KITData.dbSession is None:
+                kdata_lst[0].__init_db_connection(credentials, new_db=new_db)
+            raw_lst = KITData.dbSession.search_pids(
+                [pid_lst[i] for i in missing], workers=workers)
+            for i, raw in zip(missing, raw_lst):
+                data_lst[i] = KITData.dbSession.extract_data(raw)
+                kdata_lst[i].__store("new", pid_lst[i], data_lst[i])
+        for kdata, pid, data in zip(kdata_lst, pid_lst, data_lst):
+            kdata.__id = pid
+            kdata.__allo_data(data)
+        return kdata_lst
+
     def getRPunchDict(self):
         return self.__RPunchDict
 
@@ -272,26 +308,80 @@ class KITData(object):
                 return False
 
 
-    def __allo_db(self, pid, new_db=None):
+    def __allo_db(self, pid, new_db=None, chunksize=None):
         """Allocate measurement information.
            This works only if database connection is already established.
 
         Args:
             pid: probe id in the IEKP database
+            chunksize (None|int): rows per chunk when reading from the old
+                database
 
         """
-        if new_db is False:
-            data = KITData.dbSession.probe_search_data(pid)
-        if new_db is True:
-            data = KITData.dbSession.extract_data(KITData.dbSession.search_pid(pid))
-        self.__x = data["dataX"]
-        self.__y = data["dataY"]
-        self.__z = data["dataZ"]
-        self.__temp = data["temp"]
-        self.__humid = data["rh"]
-        self.__err = data["err"]
-        self.__bias_current = data["bias_cur"]
-        self.__time = data["time"]
+        backend = "new" if new_db is True else "old"
+        data = self.__lookup(backend, pid)
+        if data is None:
+            # Establish database connection if its no already established
+            if KITData.dbSession is None:
+                self.__init_db_connection(self.__credentials, new_db=new_db)
+            if new_db is False:
+                with KITData.dbSession.batch():
+                    data = KITData.dbSession.probe_search_data(
+                        pid, chunksize=chunksize)
+            if new_db is True:
+                data = KITData.dbSession.extract_data(
+                    KITData.dbSession.search_pid(pid))
+            self.__store(backend, pid, data)
+        self.__allo_data(data)
+
+
+    def __lookup(self, backend, pid):
+        """Look for already fetched measurement data in memory and in the
+        cache folder (if there is one)
+
+        Returns:
+            dict with measurement data or None
+
+        """
+        data = KITData.memo.get(backend, pid)
+        if data is None and self.__cache is not None:
+            data = self.__cache.get(backend, pid)
+            if data is not None:
+                KITData.memo.put(backend, pid, data)
+        return data
+
+
+    def __store(self, backend, pid, data):
+        """Keep fetched measurement data in memory and in the cache folder
+        (if there is one)"""
+        for col in KITCache.columns:
+            data[col] = to_column(data[col])
+        KITData.memo.put(backend, pid, data)
+        if self.__cache is None:
+            return True
+        try:
+            return self.__cache.put(backend, pid, data)
+        except (OSError, TypeError, ValueError) as err:
+            self.log.warning("Couldn't cache PID %s (%s)", pid, err)
+            return False
+
+
+    def __allo_data(self, data):
+        """Allocate measurement information from a dict that was returned by
+        one of the database backends.
+
+        Args:
+            data (dict): measurement data and meta information
+
+        """
+        self.__set_columns(x=data["dataX"],
+                           y=data["dataY"],
+                           z=data["dataZ"],
+                           temp=data["temp"],
+                           humid=data["rh"],
+                           err=data["err"],
+                           bias_current=data["bias_cur"],
+                           time=data["time"])
         self.__px = data["paraX"]
         self.__py = data["paraY"]
         self.__t0 = data["t0"]
@@ -313,10 +403,10 @@ class KITData(object):
 
         data = KITData.dbSession.ali_search_for_run(run)
 
-        self.__x = [data["voltage"]]
-        self.__y = [data["e_sig"]]
-        self.__z = [data["annealing"]]
-        self.__dy = [data["e_sig_err"]]
+        self.__set_columns(x=[data["voltage"]],
+                           y=[data["e_sig"]],
+                           z=[data["annealing"]],
+                           dy=[data["e_sig_err"]])
         self.__gain = data["gain"]
         self.__seed = data["seed"]
         self.__seederr = data["seed_err"]
@@ -325,6 +415,49 @@ class KITData(object):
         self.__pt = data["particletype"]
         self.__project = data["project"]
 
+    def select(self, where=None, **ranges):
+        """Keeps the data points that fulfill all conditions and drops the
+        others from every data column at once, so x, y, z, errors, temp etc.
+        stay aligned. All conditions are combined into one boolean mask.
+
+        Args:
+            where (None|array|callable): boolean mask with an entry for every
+                data point or a function that returns one for this object,
+                e.g. lambda kdata: kdata.getColumn("z") != 0
+            ranges (column=(low, high)): keeps low <= column <= high. Use None
+                for an open limit, e.g. select(x=(0, 500), temp=(None, -18))
+
+        Returns:
+            int: number of remaining data points
+
+        """
+        size = self.getSize()
+        mask = np.ones(size, dtype=bool)
+        for column, (low, high) in ranges.items():
+            values = self.getColumn(column)
+            if values.size != size:
+                raise ValueError("Column '{}' has {} entries instead of {}"
+                                 .format(column, values.size, size))
+            if low is not None:
+                mask &= values >= to_limit(low, values)
+            if high is not None:
+                mask &= values <= to_limit(high, values)
+        if callable(where):
+            where = where(self)
+        if where is not None:
+            where = np.asarray(where, dtype=bool)
+            if where.shape != (size,):
+                raise ValueError("Mask has {} entries instead of {}"
+                                 .format(where.size, size))
+            mask &= where
+
+        if not mask.all():
+            for column, values in self.__data.items():
+                if values.size == size:
+                    self.__data[column] = values[mask]
+        return int(np.count_nonzero(mask))
+
+
     def dropXLower(self, xlow=0):
         """Drops datasets if x < xlow
 
@@ -336,17 +469,7 @@ class KITData(object):
 
         """
 
-        xTemp = []
-        yTemp = []
-
-        for i,x in enumerate(self.__x):
-            if x >= float(xlow):
-                xTemp.append(x)
-                yTemp.append(self.__y[i])
-
-        self.__x = xTemp
-        self.__y = yTemp
-
+        self.select(x=(xlow, None))
         return True
 
 
@@ -361,17 +484,7 @@ class KITData(object):
 
         """
 
-        xTemp = []
-        yTemp = []
-
-        for i,x in enumerate(self.__x):
-            if x <= float(xhigh):
-                xTemp.append(x)
-                yTemp.append(self.__y[i])
-
-        self.__x = xTemp
-        self.__y = yTemp
-
+        self.select(x=(None, xhigh))
         return True
 
 
@@ -386,17 +499,7 @@ class KITData(object):
 
         """
 
-        xTemp = []
-        yTemp = []
-
-        for i,y in enumerate(self.__y):
-            if y >= float(ylow):
-                xTemp.append(self.__x[i])
-                yTemp.append(y)
-
-        self.__x = xTemp
-        self.__y = yTemp
-
+        self.select(y=(ylow, None))
         return True
 
 
@@ -411,17 +514,7 @@ class KITData(object):
 
         """
 
-        xTemp = []
-        yTemp = []
-
-        for i,y in enumerate(self.__y):
-            if y <= float(yhigh):
-                xTemp.append(self.__x[i])
-                yTemp.append(y)
-
-        self.__x = xTemp
-        self.__y = yTemp
-
+        self.select(y=(None, yhigh))
         return True
 
 
@@ -430,24 +523,19 @@ class KITData(object):
         range will be droped.
 
         Args:
-            var ("x"|"y"): range referes to either x or y
+            var ("x"|"y"|...): range referes to this data column
             low: lower limit
             high: upper limit
 
         """
 
-        if var is "x":
-            self.dropXLower(low)
-            self.dropXHigher(high)
-        elif var is "y":
-            self.dropYLower(low)
-            self.dropYHigher(high)
+        self.select(**{var: (low, high)})
 
         return True
 
 
     def includesErrors(self):
-        return True if len(self.__dx) != 0 else False
+        return True if self.__data["dx"].size != 0 else False
 
 
     ###################
@@ -468,7 +556,7 @@ class KITData(object):
 
         if inputArray is not None:
             try:
-                self.__x = inputArray
+                self.__set_columns(x=inputArray)
                 return True
             except:
                 self.log.info("Cannot set x: wrong format")
@@ -488,7 +576,7 @@ class KITData(object):
 
         if inputArray is not None:
             try:
-                self.__y = inputArray
+                self.__set_columns(y=inputArray)
                 return True
             except:
                 self.log.info("Cannot set y: wrong format")
@@ -509,7 +597,7 @@ class KITData(object):
 
         if inputArray is not None:
             try:
-                self.__z = inputArray
+                self.__set_columns(z=inputArray)
                 return True
             except:
                 self.log.info("Cannot set z: wrong format")
@@ -601,9 +689,9 @@ class KITData(object):
         """
 
         if (str(dataSet) == "x") | (dataSet == 0) :
-            return self.__x
+            return self.__data["x"].tolist()
         elif (str(dataSet) == "y") | (dataSet == 1) :
-            return self.__y
+            return self.__data["y"].tolist()
         else:
             return []
 
@@ -641,9 +729,9 @@ class KITData(object):
 
         """
         if asarray:
-            return np.asarray(self.__x)
+            return self.__data["x"]
         else:
-            return self.__x
+            return self.__data["x"].tolist()
 
 
     def getY(self,  asarray=False):
@@ -659,9 +747,9 @@ class KITData(object):
         """
 
         if asarray:
-            return np.asarray(self.__y)
+            return self.__data["y"]
         else:
-            return self.__y
+            return self.__data["y"].tolist()
 
     def getZ(self, asarray=False):
         """Returns z dataset as list or array
@@ -676,9 +764,9 @@ class KITData(object):
         """
 
         if asarray:
-            return np.asarray(self.__z)
+            return self.__data["z"]
         else:
-            return self.__z
+            return self.__data["z"].tolist()
 
     def getSeed(self):
         """Returns dx dataset as list or array
@@ -732,9 +820,9 @@ class KITData(object):
 
         """
         if asarray:
-            return np.asarray(self.__dx)
+            return self.__data["dx"]
         else:
-            return self.__dx
+            return self.__data["dx"].tolist()
 
 
     def getdY(self, asarray=False):
@@ -749,9 +837,9 @@ class KITData(object):
 
         """
         if asarray:
-            return np.asarray(self.__dy)
+            return self.__data["dy"]
         else:
-            return self.__dy
+            return self.__data["dy"].tolist()
 
 
     def getdZ(self, asarray=False):
@@ -766,9 +854,9 @@ class KITData(object):
 
         """
         if asarray:
-            return np.asarray(self.__dz)
+            return self.__data["dz"]
         else:
-            return self.__dz
+            return self.__data["dz"].tolist()
 
 
     def getSize(self):
@@ -779,7 +867,27 @@ class KITData(object):
 
         """
 
-        return len(self.__x)
+        return self.__data["x"].size
+
+
+    def getColumn(self, column="x", asarray=True):
+        """Returns any data column (x, y, z, dx, dy, dz, temp, humid, err,
+        bias_current, time) as array or list
+
+        Args:
+            column (str): name of the data column
+            asarray (True|False): dataset will be returned as
+                array(True) or list(false)
+
+        Returns:
+            array or list of the requested column
+
+        """
+        if column not in KITData.columns:
+            raise KeyError("Unknown data column '{}'".format(column))
+        if asarray:
+            return self.__data[column]
+        return self.__data[column].tolist()
 
 
     def getName(self):
@@ -861,3 +969,179 @@ class KITData(object):
 
     def getProject(self):
         return self.__project
+
+
+def to_column(values):
+    """Converts a sequence into a contiguous 1D numpy array. Numeric data is
+    stored as float64 (NULL entries become nan), timestamps as datetime64.
+    Everything else is kept with the dtype numpy infers.
+
+    Args:
+        values (None|list|tuple|array): data points of a single column
+
+    Returns:
+        numpy array
+
+    """
+    if values is None:
+        return np.empty(0)
+    try:
+        return np.ascontiguousarray(values, dtype=np.float64).ravel()
+    except (TypeError, ValueError):
+        pass
+    try:
+        return np.ascontiguousarray(values, dtype="datetime64[us]").ravel()
+    except (TypeError, ValueError):
+        return np.ascontiguousarray(values).ravel()
+
+
+def to_limit(value, column):
+    """Converts a range limit to the dtype of the column it is compared with.
+    Numeric columns accept strings like "100" as well.
+    """
+    if column.dtype.kind == "f":
+        return float(value)
+    return np.asarray(value, dtype=column.dtype)
+
+
+# data columns of a file input depending on its number of columns
+FILE_COLUMNS = {2: ("x", "y"),
+                3: ("x", "y", "z"),
+                4: ("x", "y", "dx", "dy"),
+                6: ("x", "y", "z", "dx", "dy", "dz")}
+
+
+def sniff_table(fileName, max_lines=100):
+    """Detects delimiter and number of columns of a data file by looking at
+    the first line that consists of numbers only. The lines before it are
+    treated as header.
+
+    Args:
+        fileName (str): path of the data file
+        max_lines (int): number of lines that are inspected at most
+
+    Returns:
+        tuple: (delimiter, number of columns, number of header lines)
+
+    """
+    with open(fileName, 'r') as inputFile:
+        for i, line in enumerate(inputFile):
+            if i >= max_lines:
+                break
+            if "," in line:
+                delimiter = ","
+                splited = line.split(",")
+            else:
+                delimiter = r"\s+"
+                splited = line.split()
+            try:
+                [float(val) for val in splited]
+            except ValueError:
+                continue
+            if len(splited) >= 2:
+                return delimiter, len(splited), i
+    raise ValueError("Couldn't find any data columns in {}".format(fileName))
+
+
+def count_lines(fileName, blocksize=1024**2):
+    """Counts the lines of a file without decoding them"""
+    n_lines = 0
+    last = b"\n"
+    with open(fileName, 'rb') as inputFile:
+        for block in iter(lambda: inputFile.read(blocksize), b""):
+            n_lines += block.count(b"\n")
+            last = block[-1:]
+    # last line without line break
+    if last != b"\n":
+        n_lines += 1
+    return n_lines
+
+
+def iter_table(fileName, chunksize=None):
+    """Parses a data file with pandas' C engine. Delimiter, number of
+    columns and header lines are detected only once. Lines that can't be
+    interpreted as data (comments, lines with a different number of
+    columns, ...) are dropped and counted, blank lines are ignored.
+
+    pandas only accepts a callable for 'on_bad_lines' with its slow python
+    engine, hence the lines with too many fields, which the C engine drops
+    silently, are counted as the difference between the lines of the file
+    and the rows it returned. They are added to the count of the last chunk.
+
+    Args:
+        fileName (str): path of the data file
+        chunksize (None|int): yield one result per chunk of this many lines
+            instead of one result for the whole file
+
+    Yields:
+        tuple: (dict with one float64 array per data column, number of
+            malformed lines)
+
+    """
+    delimiter, ncols, n_header = sniff_table(fileName)
+    names = FILE_COLUMNS.get(ncols, ("x", "y"))
+    # blank lines are kept as empty rows, so that every line of the file
+    # that pandas didn't drop has a row. The C engine truncates instead of
+    # drops a wide line at the start of a chunk, the additional column
+    # marks those lines as well as lines with one field too many.
+    reader = pd.read_csv(fileName, sep=delimiter, header=None,
+                         names=list(range(ncols + 1)), index_col=False,
+                         skiprows=n_header, engine="c",
+                         skipinitialspace=True, skip_blank_lines=False,
+                         on_bad_lines="skip", chunksize=chunksize)
+    if chunksize is None:
+        reader = [reader]
+    n_rows = 0
+    result = None
+    for frame in reader:
+        if result is not None:
+            yield result
+        n_rows += len(frame)
+        result = parse_frame(frame, names, ncols)
+    if result is None:
+        result = ({name: np.empty(0) for name in names}, 0)
+    n_dropped = count_lines(fileName) - n_header - n_rows
+    yield result[0], result[1] + n_dropped
+
+
+def parse_frame(frame, names, ncols):
+    """Converts a chunk of a data file to float64 arrays. See 'iter_table'.
+
+    Returns:
+        tuple: (dict with one float64 array per data column, number of
+            malformed lines)
+
+    """
+    blank = frame.isna().all(axis=1).to_numpy()
+    block = frame.iloc[:, :len(names)].apply(pd.to_numeric, errors="coerce")\
+                 .to_numpy(dtype=np.float64)
+    valid = ~np.isnan(block).any(axis=1) & frame[ncols].isna().to_numpy()
+    block = block[valid]
+    n_bad = int(valid.size - np.count_nonzero(valid | blank))
+    return ({name: np.ascontiguousarray(block[:, i])
+             for i, name in enumerate(names)}, n_bad)
+
+
+def read_table(fileName, chunksize=None):
+    """Reads a whole data file into a dict of float64 arrays. In chunked mode
+    the file is parsed piecewise and the chunks are concatenated once in the
+    end, which keeps the peak memory low for huge files.
+
+    Args:
+        fileName (str): path of the data file
+        chunksize (None|int): number of lines that are parsed at once
+
+    Returns:
+        tuple: (dict with one float64 array per data column, number of
+            malformed lines)
+
+    """
+    chunks = []
+    n_bad = 0
+    for cols, bad in iter_table(fileName, chunksize):
+        chunks.append(cols)
+        n_bad += bad
+    if len(chunks) == 1:
+        return chunks[0], n_bad
+    return ({name: np.concatenate([chunk[name] for chunk in chunks])
+             for name in chunks[0]}, n_bad)
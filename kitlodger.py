@@ -46,7 +46,7 @@ class KITLodger(object):
 
     def add_to_plot(self):
 
-        ax = self.fig.add_subplot(1, 1, 1)
+        ax = self.fig.gca()
 
         if self.__x is None and self.__y is None and self.__text is None:
             self.log.info("Lodger:::Lodger arrived with an empty suitcase. Goodbye.")
@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 #pylint: disable=C0103,R0902,R0912,R0915,R0914,W0201
 from collections import OrderedDict
-import itertools
 import logging
+import matplotlib.colors
+import matplotlib.lines
 import matplotlib.ticker
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.figure import Figure
 import numpy as np
 from scipy.stats import norm
 from .kitdata import KITData
@@ -13,11 +17,23 @@ from .Utils import kitutils
 from .Utils.find_dep import FindDep
 
 class KITMatplotlib():
-    """Matplotlib based automated plotting class for KITPlot"""
-    def __init__(self, cfg=None, new_cfg=None):
+    """Matplotlib based automated plotting class for KITPlot
+
+       Args:
+        - cfg (KITConfig): Plot parameters
+        - new_cfg (bool): Set axis labels and titles automatically
+        - headless (bool): Create figures directly on an Agg canvas instead of
+                           using pyplot's figure manager. These figures can't
+                           be shown, but are faster to create, are never
+                           kept alive by pyplot and can be drawn in parallel
+    """
+    def __init__(self, cfg=None, new_cfg=None, headless=False):
 
         self.__graphs = []
+        self.__drawn = []
         self.__lodgers = []
+        self.__styles = []
+        self.__proxies = []
 
         # KITcolor dictionary
         self.KITcolor = kitutils.get_KITcolor()
@@ -34,6 +50,7 @@ class KITMatplotlib():
         # load style parameters from cfg file
         self.__initStyle(cfg)
         self.__new_cfg = new_cfg
+        self.headless = headless
 
 
     def __initStyle(self, cfg):
@@ -86,12 +103,15 @@ class KITMatplotlib():
         self.lineWidth = cfg['Line', 'Width']
         self.lineStyle = kitutils.extractList(cfg['Line', 'Style'])
         self.err = cfg['Line', 'ErrorBars']
+        self.bulkThreshold = cfg['Line', 'BulkThreshold']
 
         # KITPlot specific options
         self.cv_norm = cfg['Misc', 'CVMeasurement']
         self.norm = kitutils.extractList(cfg['Misc', 'Normalization'])
         self.splitGraph = cfg['Misc', 'SplitGraph']
         self.show_stats = cfg['Misc', 'ShowStats']
+        self.downsampling = cfg['Misc', 'Downsampling']
+        self.dpi = cfg['Output', 'DPI']
 
         # legend options
         self.__entryDict = cfg['Legend', 'EntryList']
@@ -146,28 +166,23 @@ class KITMatplotlib():
         if isinstance(arg, KITData):
             if KITData().getRPunchDict() is None:
                 if self.absX:
-                    x = list(np.absolute(arg.getX()))
+                    x = np.absolute(arg.getX(asarray=True))
                 else:
-                    x = arg.getX()
+                    x = arg.getX(asarray=True)
                 if self.absY:
-                    y = list(np.absolute(arg.getY()))
-                else:
-                    y = arg.getY()
-                if arg.getdX() != [] and arg.getdY() != []:
-                    dx = arg.getdX()
-                    dy = arg.getdY()
-                elif arg.getdX() == [] and arg.getdY() == []:
-                    pass
+                    y = np.absolute(arg.getY(asarray=True))
                 else:
+                    y = arg.getY(asarray=True)
+                dx = arg.getdX(asarray=True)
+                dy = arg.getdY(asarray=True)
+                if (dx.size == 0) != (dy.size == 0):
                     raise ValueError("Check data table. Only 2 (x,y) or "
                                      "4 (x,y,dx,dy) coordinates are allowed.")
                 # create graph list
-                if dx == [] and dy == []:
+                if dx.size == 0:
                     self.__graphs.append([x, y])
-                elif dx != [] and dy != []:
-                    self.__graphs.append([x, y, dx, dy])
                 else:
-                    raise ValueError("z-error not implemented yet")
+                    self.__graphs.append([x, y, dx, dy])
             # Rpunch
             else:
                 raise ValueError("Dictionary error")
@@ -203,10 +218,11 @@ class KITMatplotlib():
         return True
 
 
-    def draw(self, fileList, reset=False):
+    def draw(self, fileList, reset=False, fig=None):
         """Extracts data sets from fileList, extracts plot parameters from cfg
         (plot options, legend information, plot dimensions, axis labeling,
-        marker and graph options, ...) and applies them"""
+        marker and graph options, ...) and applies them. If 'fig' is given,
+        that figure is cleared and drawn on instead of creating a new one."""
         # create self.__graphs list
         for dset in fileList:
             self.addGraph(dset)
@@ -241,8 +257,15 @@ class KITMatplotlib():
         if msg != "":
             self.log.info(msg)
 
+        # reduce long series to what the canvas can resolve, statistics are
+        # still calculated from all points
+        if self.hist is not True:
+            self.__drawn = self.downsample()
+        else:
+            self.__drawn = self.__graphs
+
         # create an empty canvas with canvas size in [inch]: 1 inch = 2.54 cm
-        fig = plt.figure(figsize=list(map(lambda x: x/2.54, self.canvasSize)))
+        fig = self.get_figure(fig)
         # specify (nrows, ncols, axnum)
         ax = fig.add_subplot(1, 1, 1)
         # adjust pad size: [left, bottom, width, height]
@@ -250,15 +273,20 @@ class KITMatplotlib():
 
 
         # adjust axis tick
-        self.adjust_axis_tick()
+        self.adjust_axis_tick(ax)
+
+        # resolve style of all graphs before drawing
+        self.__styles = self.__compileStyles()
+
+        # draw many graphs as collections instead of one artist per graph
+        bulk = self.hist is not True and self.useBulkMode()
+        self.__proxies = []
+        if bulk:
+            self.draw_bulk(ax)
 
         # draw graphs
         for i, table in enumerate(self.__graphs):
-            if isinstance(self.hollowMarker, list) and i in self.hollowMarker\
-                    or self.hollowMarker is True:
-                markerface = 'None'
-            else:
-                markerface = self.getColor(i)
+            color, marker, linestyle, label, markerface = self.__styles[i]
 
             if self.hist is True:
                 if self.bin_width == "auto":
@@ -270,8 +298,8 @@ class KITMatplotlib():
                         self.bin_width)
                 _, bins, _ = ax.hist(table[1],
                                      bins,
-                                     color=self.getColor(i),
-                                     label=self.getLabel(i))
+                                     color=color,
+                                     label=label)
                 if self.show_stats is True:
                     try:
                         mu, std = norm.fit(table[1])
@@ -285,16 +313,17 @@ class KITMatplotlib():
                     # p = norm.pdf(x, loc=mu, scale=std)
                     # ax.plot(x, p, "r--", color="g")
             else:
-                ax.plot(table[0],                           # x-axis
-                        table[1],                           # y-axis
-                        color=self.getColor(i),             # line color
-                        marker=self.getMarker(i),           # marker style
-                        markersize=self.markerSize,
-                        markerfacecolor=markerface,
-                        markeredgewidth=self.markerWidth,
-                        linewidth=self.lineWidth,
-                        linestyle=self.getLineStyle(i),
-                        label=self.getLabel(i))
+                if not bulk:
+                    ax.plot(self.__drawn[i][0],             # x-axis
+                            self.__drawn[i][1],             # y-axis
+                            color=color,                    # line color
+                            marker=marker,                  # marker style
+                            markersize=self.markerSize,
+                            markerfacecolor=markerface,
+                            markeredgewidth=self.markerWidth,
+                            linewidth=self.lineWidth,
+                            linestyle=linestyle,
+                            label=label)
                 if self.show_stats is True:
                     try:
                         mu = np.mean(table[1][:-2])
@@ -312,8 +341,9 @@ class KITMatplotlib():
                     except: #pylint: disable=bare-except
                         self.log.warning("Error during V_dep calculation...")
 
-            # set error bars
-            self.set_error_bars(ax, table)
+        # set error bars of all graphs
+        if not bulk:
+            self.set_error_bars(ax)
 
         # set titles
         self.set_titles(ax, fileList)
@@ -337,6 +367,155 @@ class KITMatplotlib():
         # ax.xaxis.set_major_formatter(FixedOrderFormatter(1e3))
         return fig, ax
 
+    def downsample(self):
+        """ Returns the graphs in .__graphs decimated to the width of the pad
+        in pixels according to 'Downsampling': "lttb" keeps two points per
+        pixel column chosen by the Largest-Triangle-Three-Buckets algorithm,
+        "minmax" keeps the minimum and maximum of every pixel column. All
+        columns of a graph (x, y, dx, dy) are reduced alike.
+        """
+        if self.downsampling in [False, None, "off"]:
+            return self.__graphs
+        if self.downsampling not in ["lttb", "minmax"]:
+            self.log.warning("Invalid 'Downsampling' value. Request rejected.")
+            return self.__graphs
+        # pad width in pixels
+        width = int(self.canvasSize[0]/2.54 * self.dpi * self.padSize[2])
+        graphs = []
+        before = 0
+        after = 0
+        for table in self.__graphs:
+            x = np.asarray(table[0], dtype=float)
+            y = np.asarray(table[1], dtype=float)
+            if x.ndim != 1 or x.shape != y.shape:
+                graphs.append(table)
+                continue
+            if self.downsampling == "lttb":
+                indices = kitutils.lttb_indices(x, y, 2*width)
+            else:
+                indices = kitutils.minmax_indices(x, y, width, bool(self.logX))
+            if len(indices) < len(x):
+                graphs.append([np.asarray(col)[indices] for col in table])
+            else:
+                graphs.append(table)
+            before += len(x)
+            after += len(indices)
+        if after < before:
+            self.log.info("Downsampled graphs from %i to %i points "
+                          "(ratio %.1f)", before, after, before/after)
+        return graphs
+
+
+    def get_figure(self, fig=None):
+        """ Returns an empty figure with the size given by 'CanvasSize'. An
+        existing figure is cleared and resized, so a batch of plots can reuse
+        it. Headless figures are created on an Agg canvas without pyplot.
+        """
+        size = [length/2.54 for length in self.canvasSize]
+        if fig is not None:
+            fig.clear()
+            fig.set_size_inches(size)
+            return fig
+        if self.headless is True:
+            fig = Figure(figsize=size)
+            FigureCanvasAgg(fig)
+            return fig
+        return plt.figure(figsize=size)
+
+
+    def useBulkMode(self):
+        """ Returns True if the graphs should be drawn as collections, which is
+        the case if there are more graphs than 'BulkThreshold'. Set it to
+        false to always draw one artist per graph.
+        """
+        if isinstance(self.bulkThreshold, bool) \
+                or not isinstance(self.bulkThreshold, (int, float)):
+            return False
+        return len(self.__graphs) > self.bulkThreshold
+
+
+    def draw_bulk(self, ax_obj):
+        """ Draws all graphs at once: the lines as a single LineCollection, the
+        markers as one marker-only line per distinct marker style and the
+        error bars as one more collection. Colors and styles of the graphs are
+        kept and the legend entries are represented by proxy artists.
+        """
+        segments = []
+        seg_colors = []
+        seg_styles = []
+        points = OrderedDict()
+        no_style = (None, "None", "none", "", " ")
+        for table, style in zip(self.__drawn, self.__styles):
+            color, marker, linestyle, label, markerface = style
+            xy = np.column_stack((np.asarray(table[0], dtype=float),
+                                  np.asarray(table[1], dtype=float)))
+            if linestyle not in no_style:
+                segments.append(xy)
+                seg_colors.append(color)
+                seg_styles.append(linestyle)
+            if marker not in no_style:
+                # graphs that share a marker style share one artist
+                points.setdefault((marker, matplotlib.colors.to_hex(color),
+                                   markerface), []).append(xy)
+            self.__proxies.append(matplotlib.lines.Line2D(
+                [], [], color=color, marker=marker, markersize=self.markerSize,
+                markerfacecolor=markerface, markeredgewidth=self.markerWidth,
+                linewidth=self.lineWidth, linestyle=linestyle, label=label))
+
+        if segments:
+            ax_obj.add_collection(LineCollection(
+                segments, colors=seg_colors, linestyles=seg_styles,
+                linewidths=self.lineWidth, zorder=2), autolim=True)
+        for (marker, color, markerface), xys in points.items():
+            xy = np.concatenate(xys)
+            ax_obj.plot(xy[:, 0], xy[:, 1], color=color, marker=marker,
+                        markersize=self.markerSize,
+                        markerfacecolor=markerface,
+                        markeredgewidth=self.markerWidth, linestyle="None")
+        self.__bulk_error_bars(ax_obj)
+        ax_obj.autoscale_view()
+        return True
+
+
+    def __bulk_error_bars(self, ax_obj):
+        """ Draws the error bars of all graphs as a single LineCollection or
+        their error bands as a single PolyCollection ('ErrorBars': "filled")
+        """
+        if self.err not in [True, "filled"]:
+            return True
+        bars = []
+        bar_colors = []
+        bands = []
+        band_colors = []
+        for table, style in zip(self.__drawn, self.__styles):
+            if len(table) != 4:
+                self.log.warning("Can't find x- and y-errors in file. Request "
+                                 "rejected.")
+                continue
+            x, y, dx, dy = (np.asarray(col, dtype=float) for col in table)
+            if self.err is True:
+                # one horizontal and one vertical bar per point
+                bars.append(np.stack((
+                    np.column_stack((x - dx, y, x + dx, y)),
+                    np.column_stack((x, y - dy, x, y + dy)))).reshape(-1, 2, 2))
+                bar_colors.extend([style[0]] * (2 * len(x)))
+            else:
+                y1, y2 = error_band(y, dx, dy)
+                bands.append(np.concatenate((
+                    np.column_stack((x, y1)),
+                    np.column_stack((x, y2))[::-1])))
+                band_colors.append(style[0])
+        if bars:
+            ax_obj.add_collection(LineCollection(
+                np.concatenate(bars), colors=bar_colors, linewidths=1,
+                zorder=2), autolim=True)
+        if bands:
+            ax_obj.add_collection(PolyCollection(
+                bands, facecolors=band_colors, alpha=0.3, linewidths=0),
+                                  autolim=True)
+        return True
+
+
     def set_titles(self, ax_obj, fileList):
         """Set plot titles"""
         if self.__new_cfg is True:
@@ -378,51 +557,46 @@ class KITMatplotlib():
                 ax_obj.get_yaxis().set_major_formatter(matplotlib.ticker.ScalarFormatter())
 
 
-    def set_error_bars(self, ax_obj, table):
-        """Sets up error bars"""
-        for i, table in enumerate(self.__graphs):
-            if len(table) == 4 and self.err is True:
+    def set_error_bars(self, ax_obj):
+        """Sets up error bars. Every graph in .__graphs gets its bars drawn
+        exactly once, so this is called once after all graphs are drawn."""
+        if self.err not in [True, "filled"]:
+            return True
+        for table, style in zip(self.__drawn, self.__styles):
+            if len(table) != 4:
+                self.log.warning("Can't find x- and y-errors in file. Request "
+                                 "rejected.")
+            elif self.err is True:
                 ax_obj.errorbar(
                     table[0], table[1], xerr=table[2], yerr=table[3],
-                    color=self.getColor(i), elinewidth=1)
-            elif len(table) == 4 and self.err == "filled":
-                y1 = []
-                y2 = []
-                if all(table[2]) == 0:
-                    for y, err in zip(table[1], table[3]):
-                        y1.append(y - err)
-                        y2.append(y + err)
-                else:
-                    for y, _min, _max in zip(table[1], table[2], table[3]):
-                        y1.append(y - _min)
-                        y2.append(y + _max)
-
+                    color=style[0], elinewidth=1)
+            else:
+                y1, y2 = error_band(*(np.asarray(col, dtype=float)
+                                      for col in table[1:]))
                 ax_obj.fill_between(
-                    table[0], y1, y2, alpha=0.3, lineWidth=0,
-                    color=self.getColor(i))
-            elif len(table) != 4 and self.err in [True, "filled"]:
-                self.log.warning("Can't find x- and y-errors in file. Request "
-                                 "rejected.")
+                    table[0], y1, y2, alpha=0.3, linewidth=0,
+                    color=style[0])
+        return True
 
-    def adjust_axis_tick(self):
-        """Adjusts the axis ticks"""
+    def adjust_axis_tick(self, ax_obj):
+        """Adjusts the axis ticks of 'ax_obj'"""
         if isinstance(self.tickX, bool):
             if self.tickX:
-                plt.ticklabel_format(style='sci', axis='x', scilimits=(0, 0))
+                ax_obj.ticklabel_format(style='sci', axis='x', scilimits=(0, 0))
             # else:
-            #     plt.ticklabel_format(axis='x', useOffset=False)
+            #     ax_obj.ticklabel_format(axis='x', useOffset=False)
         if isinstance(self.tickY, bool):
             if self.tickY:
-                plt.ticklabel_format(style='sci', axis='y', scilimits=(0, 0))
+                ax_obj.ticklabel_format(style='sci', axis='y', scilimits=(0, 0))
             # else:
-            #     plt.ticklabel_format(axis='y', useOffset=False)
+            #     ax_obj.ticklabel_format(axis='y', useOffset=False)
         if not isinstance(self.tickX, bool):
             if isinstance(self.tickX, int) or isinstance(self.tickX, float):
-                plt.ticklabel_format(
+                ax_obj.ticklabel_format(
                     style='sci', axis='x', scilimits=(self.tickX, self.tickX))
         if not isinstance(self.tickY, bool):
             if isinstance(self.tickY, int) or isinstance(self.tickY, float):
-                plt.ticklabel_format(
+                ax_obj.ticklabel_format(
                     style='sci', axis='y', scilimits=(self.tickY, self.tickY))
 
 
@@ -433,6 +607,10 @@ class KITMatplotlib():
 
         # reorder legend items according to 'EntryList'
         handles, labels = obj.get_legend_handles_labels()
+        if self.__proxies:
+            # graphs drawn in bulk mode are represented by proxy artists
+            handles = self.__proxies + handles
+            labels = [proxy.get_label() for proxy in self.__proxies] + labels
         handles = kitutils.adjustOrder(handles, self.__entryDict, total_len)
         labels = kitutils.adjustOrder(labels, self.__entryDict, total_len)
 
@@ -469,8 +647,7 @@ class KITMatplotlib():
 
 
     def getLabel(self, index):
-        label = [items[1] for items in list(self.__entryDict.items())]
-        return label[index]
+        return list(self.__entryDict.values())[index]
 
 
     def getMarker(self, index):
@@ -487,17 +664,16 @@ class KITMatplotlib():
             if isinstance(self.markerSet, int):
                 return list(self.markers.keys())[self.markerSet]
             # cycle list
-            if isinstance(self.markerSet, list):
-                for i, item in enumerate(itertools.cycle(self.markerSet)):
-                    if i == index:
-                        if isinstance(item, str):
-                            if item.isdigit():
-                                return list(self.markers.keys())[int(item)]
-                            if item in self.markers:
-                                return item
-                        if isinstance(item, int):
-                            return list(self.markers.keys())[item]
-                        raise Exception
+            if isinstance(self.markerSet, list) and self.markerSet:
+                item = self.markerSet[index % len(self.markerSet)]
+                if isinstance(item, str):
+                    if item.isdigit():
+                        return list(self.markers.keys())[int(item)]
+                    if item in self.markers:
+                        return item
+                if isinstance(item, int):
+                    return list(self.markers.keys())[item]
+                raise Exception
         except:
             self.log.warning("Invalid value in 'MarkerSet'. Using default instead.")
             return list(self.markers.keys())[index]
@@ -517,21 +693,18 @@ class KITMatplotlib():
             # self.colors represents color_keys in KITcolor
             if all(isinstance(item, int) for item in self.colorSet) \
                         and isinstance(self.colorSet, list):
-                for i, item in enumerate(itertools.cycle(self.colorSet)):
-                    if i == index:
-                        color = self.KITcolor[self.colors[item]][0][1]
-                        return color
+                if self.colorSet:
+                    item = self.colorSet[index % len(self.colorSet)]
+                    color = self.KITcolor[self.colors[item]][0][1]
+                    return color
 
             # if colors in 'ColorSet' are strings and correspond to entries
             # in KITcolor dict
             elif all(isinstance(item, str) for item in self.colorSet) \
                         and isinstance(self.colorSet, list):
-                # in case there are less entries in colorSet than needed we n
-                # eed to cycle that list
-                for i, cycled in enumerate(itertools.cycle(self.colorSet)):
-                    if i == index:
-                        color = cycled
-                        break
+                # in case there are less entries in colorSet than needed we
+                # need to cycle that list
+                color = self.colorSet[index % len(self.colorSet)]
                 # search for RGB values in KITcolor dict for given color key
                 for colorDict in list(self.KITcolor.values()):
                     try:
@@ -541,9 +714,8 @@ class KITMatplotlib():
 
         except:
             self.log.warning("Invalid input in 'ColorSet'. Using default instead.")
-            for i, color in enumerate(itertools.cycle(self.colors)):
-                if i == index:
-                    return list(self.KITcolor[color].values())[0]
+            color = self.colors[index % len(self.colors)]
+            return list(self.KITcolor[color].values())[0]
 
 
     def getLineStyle(self, index):
@@ -551,17 +723,15 @@ class KITMatplotlib():
             if isinstance(self.lineStyle, int):
                 return self.lines[self.lineStyle]
             if all(isinstance(item, str) for item in self.lineStyle) \
-                    and isinstance(self.lineStyle, list):
-                for i, item in enumerate(itertools.cycle(self.lineStyle)):
+                    and isinstance(self.lineStyle, list) and self.lineStyle:
+                # items are validated up to the requested one
+                for item in self.lineStyle[:index + 1]:
                     if item not in self.lines:
                         raise ValueError
-                    if index == i:
-                        return item
+                return self.lineStyle[index % len(self.lineStyle)]
             if all(isinstance(item, int) for item in self.lineStyle) \
-                    and isinstance(self.lineStyle, list):
-                for i, item in enumerate(itertools.cycle(self.lineStyle)):
-                    if index == i:
-                        return self.lines[item]
+                    and isinstance(self.lineStyle, list) and self.lineStyle:
+                return self.lines[self.lineStyle[index % len(self.lineStyle)]]
             if self.lineStyle == "None":
                 return "None"
             raise ValueError
@@ -570,6 +740,34 @@ class KITMatplotlib():
             return self.lines[1]
 
 
+    def getStyles(self):
+        """ Returns the style of every graph in .__graphs as a list of tuples
+        (color, marker, linestyle, label, facecolor). The styles are resolved
+        from the cfg once per 'draw' call instead of once per artist.
+        """
+        return self.__styles
+
+
+    def __compileStyles(self):
+        """ Resolves color, marker, line style, legend label and marker face
+        color of all graphs in .__graphs.
+        """
+        labels = list(self.__entryDict.values())
+        if isinstance(self.hollowMarker, list):
+            hollow = set(self.hollowMarker)
+        styles = []
+        for i in range(len(self.__graphs)):
+            color = self.getColor(i)
+            if isinstance(self.hollowMarker, list) and i in hollow\
+                    or self.hollowMarker is True:
+                markerface = 'None'
+            else:
+                markerface = color
+            styles.append((color, self.getMarker(i), self.getLineStyle(i),
+                           labels[i], markerface))
+        return styles
+
+
     def getGraphList(self):
         return self.__graphs
 
@@ -699,3 +897,12 @@ def auto_axis_labeling(file_lst):
             autotitleX = "X Value"
 
     return autotitle, autotitleX, autotitleY
+
+def error_band(y, dx, dy):
+    """ Returns the lower and upper edge of the error band around y. The
+    columns dx and dy are read as lower and upper error, unless dx contains
+    a zero. Then dy is used as symmetric error.
+    """
+    if np.all(dx):
+        return y - dx, y + dy
+    return y - dy, y + dy
@@ -3,16 +3,23 @@
 """A matplotlib based python plot framework"""
 from __future__ import absolute_import
 import os
+import time
 import warnings
 import json
 import logging
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from scipy import stats
 from .kitdata import KITData
 from .KITConfig import KITConfig
 from .kitmatplotlib import KITMatplotlib
 from .kitlodger import KITLodger
+from .kitcache import KITCache
 
 class KITPlot():
     """The framework's main class that handles the data input and top level
@@ -22,6 +29,17 @@ class KITPlot():
         - cfg (str): Path to existing cfg file that contains plot parameters
         - defaultCfg (str): Path to existing cfg file that is used as a
                             blueprint for creating a new cfg file
+        - workers (int): Number of workers that load the files of a folder
+                         input or fetch PIDs from the database in parallel
+                         (1 disables parallel loading of files)
+        - pool (str): 'thread' or 'process' pool for parallel loading
+        - cache (bool): Keep measurements fetched from the database in a
+                        local cache folder and reuse them (default: False)
+        - cache_dir (str): Path of the cache folder (default: 'KITPlot'
+                           folder in the user's cache directory)
+        - refresh (bool): Ignore cached measurements and fetch them again
+        - headless (bool): Draw on figures without pyplot's figure manager.
+                           'showCanvas' doesn't block then, but only saves
     """
     def __init__(self, **kwargs):
         self.log = logging.getLogger(__class__.__name__)
@@ -49,6 +67,19 @@ class KITPlot():
         self.opt_reset = kwargs.get('reset_legend', None)
         self.opt_split = kwargs.get('split_graph', None)
         self.base_name = kwargs.get('name', None)
+        # number of workers and pool type ('thread'|'process') for loading
+        # folders with many files
+        self.workers = kwargs.get('workers', None)
+        self.pool = kwargs.get('pool', "thread")
+        # local cache for measurements that were fetched from the database
+        if kwargs.get('cache', False):
+            self.cache = KITCache(directory=kwargs.get('cache_dir', None),
+                                  refresh=kwargs.get('refresh', False))
+        else:
+            self.cache = None
+        if kwargs.get('refresh', False):
+            KITData.memo.clear()
+        self.headless = kwargs.get('headless', False)
         if kwargs.get('old_db', False):
             self.new_db = False
         else:
@@ -133,10 +164,16 @@ class KITPlot():
             elif isinstance(dataInput, (list, tuple)):
                 if all([isinstance(elem, int) for elem in dataInput]):
                     self.log.info("Input interpreted as list with multiple PIDs")
+                    kdata_lst = KITData.from_pids(dataInput,
+                                                  new_db=self.new_db,
+                                                  workers=self.workers,
+                                                  cache=self.cache)
                 else:
                     self.log.info("Input interpreted as raw data")
-                for i, tup in enumerate(dataInput):
-                    self.__files.append(KITData(tup, new_db=self.new_db))
+                    kdata_lst = [KITData(tup, new_db=self.new_db)
+                                 for tup in dataInput]
+                for i, kdata in enumerate(kdata_lst):
+                    self.__files.append(kdata)
                     try:
                         self.__files[-1].setName(self.name_lst[i])
                     except:
@@ -144,30 +181,28 @@ class KITPlot():
 
             # Load single integer PID
             elif isinstance(dataInput, int):
-                self.__files.append(KITData(dataInput))
+                self.__files.append(KITData(dataInput, cache=self.cache))
 
             elif isinstance(dataInput, str):
                 # Load single string PID
                 if dataInput.isdigit():
-                    kdata = KITData(dataInput, new_db=self.new_db)
+                    kdata = KITData(dataInput, new_db=self.new_db,
+                                    cache=self.cache)
                     self.log.info("Input interpreted as single PID")
                     self.__files.append(kdata)
 
                 # Load multiple data files in a folder
                 elif os.path.isdir(dataInput):
                     self.log.info("Input interpreted as folder with files")
-                    for i, inputFile in enumerate(os.listdir(dataInput)):
-                        if os.path.splitext(inputFile)[1] == ".txt" \
-                                or os.path.splitext(inputFile)[1] == ".yml":
-                            self.__files.append(
-                                KITData(dataInput + inputFile,
-                                        self.new_db)
-                                )
-                            try:
-                                self.__files[-1].setName(self.name_lst[i])
-                            except:
-                                pass
-                        else:
+                    file_lst = sorted(
+                        os.path.join(dataInput, inputFile)
+                        for inputFile in os.listdir(dataInput)
+                        if os.path.splitext(inputFile)[1] in [".txt", ".yml"])
+                    for i, kdata in enumerate(self.__load_files(file_lst)):
+                        self.__files.append(kdata)
+                        try:
+                            self.__files[-1].setName(self.name_lst[i])
+                        except:
                             pass
 
                 # Load file
@@ -176,18 +211,24 @@ class KITPlot():
                     if checkPID(dataInput) is True:
                         self.log.info("Input interpreted as file with PID(s)")
                         with open(dataInput) as inputFile:
-                            fileList = []
+                            pid_lst = []
+                            line_lst = []
                             for i, line in enumerate(inputFile):
                                 entry = line.split()
                                 if entry[0].isdigit():
-                                    fileList.append(\
-                    KITData(dataInput=entry[0],
-                            measurement=self.__cfg['General', 'Measurement'],
-                            new_db=self.new_db))
-                                    try:
-                                        fileList[-1].setName(self.name_lst[i])
-                                    except:
-                                        pass
+                                    pid_lst.append(entry[0])
+                                    line_lst.append(i)
+                            fileList = KITData.from_pids(
+                                pid_lst,
+                                measurement=self.__cfg['General', 'Measurement'],
+                                new_db=self.new_db,
+                                workers=self.workers,
+                                cache=self.cache)
+                            for i, kdata in zip(line_lst, fileList):
+                                try:
+                                    kdata.setName(self.name_lst[i])
+                                except:
+                                    pass
                             # if measurement == "probe":
                             self.__files = fileList
                             # elif measurement == "alibava":
@@ -209,31 +250,56 @@ class KITPlot():
                     if all([n.isdigit() for n in entry]):
                         self.log.info("Input interpreted as argument with"
                                       "multiple PIDs ")
-                        for pid in entry:
-                            kdata = KITData(pid, new_db=self.new_db)
-                            self.__files.append(kdata)
+                        self.__files.extend(
+                            KITData.from_pids(entry, new_db=self.new_db,
+                                              workers=self.workers,
+                                              cache=self.cache))
 
+        if self.cache is not None \
+                and self.cache.hits + self.cache.misses != 0:
+            self.log.info("Measurement cache: %(hits)i hit(s), "
+                          "%(misses)i miss(es), %(entries)i entries",
+                          self.cache.stats())
 
         return True
 
 
-    def draw(self, dataInput=None):
+    def __load_files(self, file_lst):
+        """Creates a KITData object for every file in 'file_lst'. The files
+        are parsed concurrently by a thread or process pool with
+        'self.workers' workers. The order of the returned list matches the
+        order of 'file_lst'.
+        """
+        start = time.perf_counter()
+        if self.workers == 1 or len(file_lst) < 2:
+            results = [load_file(path, self.new_db) for path in file_lst]
+        else:
+            if self.pool == "process":
+                executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                executor = ThreadPoolExecutor(max_workers=self.workers)
+            with executor:
+                results = list(executor.map(
+                    load_file, file_lst, [self.new_db]*len(file_lst)))
+        for path, (_, duration) in zip(file_lst, results):
+            self.log.debug("Loaded %s in %.3f s", os.path.basename(path),
+                           duration)
+        self.log.info("Loaded %i file(s) in %.3f s", len(file_lst),
+                      time.perf_counter() - start)
+        return [kdata for kdata, _ in results]
+
+    def draw(self, dataInput=None, fig=None):
         """Searches for cfg file, load plot parameters, creates canvas, graphs
-        and lodgers.
+        and lodgers. An existing figure 'fig' is cleared and reused.
         """
-        # create graphs and canvas
         if dataInput is None:
-            self.canvas, self.ax = KITMatplotlib(
-                self.__cfg,
-                self.check_if_new_cfg(self.__cfg.getDir(),
-                                      self.__inputName))\
-                    .draw(self.__files, reset=self.opt_reset)
-        else:
-            self.canvas, self.ax = KITMatplotlib(
-                self.__cfg,
-                self.check_if_new_cfg(
-                    self.__cfg.getDir(), self.__inputName)).draw(
-                        dataInput, reset=self.opt_reset)
+            dataInput = self.__files
+        # create graphs and canvas
+        self.canvas, self.ax = KITMatplotlib(
+            self.__cfg,
+            self.check_if_new_cfg(self.__cfg.getDir(), self.__inputName),
+            headless=self.headless).draw(
+                dataInput, reset=self.opt_reset, fig=fig)
 
         # check if there are lodgers in cfg and if so, add them to plot
         self.getLodgers()
@@ -244,22 +310,53 @@ class KITPlot():
         """Make canvas pop up """
         if self.canvas:
             if save is True:
+                # background exports are written while the canvas is shown
                 self.saveCanvas()
+            if self.headless is True:
+                self.log.info("Headless canvas can't be shown")
+                return True
             plt.draw()
             plt.waitforbuttonpress(0)
-            plt.close()
+            self.closeCanvas()
         else:
             self.log.info("There is no canvas to show")
         return True
 
-    def saveCanvas(self):
-        """Saves output as png and pdf file"""
-        png_out = os.path.join("output", self.__inputName) + ".png"
-        pdf_out = os.path.join("output", self.__inputName) + ".pdf"
-        self.canvas.savefig(png_out)
-        self.canvas.savefig(pdf_out)
+    def closeCanvas(self):
+        """Releases the canvas. Figures created by pyplot are closed so that
+        pyplot doesn't keep them alive."""
+        if self.canvas is not None and self.headless is not True:
+            plt.close(self.canvas)
+        self.canvas = None
+        self.ax = None
         return True
 
+    def saveCanvas(self, formats=None, dpi=None, background=None):
+        """Saves the canvas in every format of 'Output/Formats' (e.g. png, pdf,
+        svg) into 'Output/Directory'. The arguments override the respective
+        cfg values. With 'background' the files are written by a background
+        thread from a copy of the canvas.
+
+        Returns:
+            list: paths of the saved files or a Future of it if 'background'
+        """
+        if formats is None:
+            formats = self.__cfg['Output', 'Formats']
+        if isinstance(formats, str):
+            formats = formats.replace("[", "").replace("]", "").split(",")
+        if dpi is None:
+            dpi = self.__cfg['Output', 'DPI']
+        if background is None:
+            background = self.__cfg['Output', 'Background']
+        out_dir = self.__cfg['Output', 'Directory']
+        os.makedirs(out_dir, exist_ok=True)
+        path = os.path.join(out_dir, self.__inputName)
+        if background is True:
+            return get_exporter().submit(
+                export_figure, snapshot_figure(self.canvas), path, formats,
+                dpi)
+        return export_figure(self.canvas, path, formats, dpi)
+
 ######################
 ### Lodger methods ###
 ######################
@@ -465,6 +562,133 @@ class KITPlot():
             self.log.error("Error while trying to split up the data...")
             return data_input
 
+def load_file(path, new_db=True):
+    """Creates a KITData object from a data file and measures how long it
+    took. Module level function so that it can be used by process pools.
+
+    Returns:
+        tuple: (KITData, duration in s)
+    """
+    start = time.perf_counter()
+    kdata = KITData(path, new_db=new_db)
+    return kdata, time.perf_counter() - start
+
+
+# figure that is reused by all plots rendered in the same worker
+_RENDER = threading.local()
+
+
+def render_plot(dataInput, cfg=None, kwargs=None):
+    """Draws and saves a single plot on a headless canvas. The figure is
+    kept and reused by the next plot that is rendered in the same worker.
+    Module level function so that it can be used by process pools.
+
+    Returns:
+        list: paths of the saved output files (None if the plot failed)
+    """
+    options = dict(kwargs or {}, cfg=cfg, headless=True)
+    kplot = None
+    try:
+        kplot = KITPlot(**options)
+        kplot.addFiles(dataInput)
+        kplot.draw(fig=getattr(_RENDER, "figure", None))
+        return kplot.saveCanvas(background=False)
+    except Exception as err: #pylint: disable=broad-except
+        logging.getLogger("KITPlot").error("Couldn't render %s: %s",
+                                           dataInput, err)
+        return None
+    finally:
+        if kplot is not None and kplot.getCanvas() is not None:
+            _RENDER.figure = kplot.getCanvas()
+            kplot.closeCanvas()
+
+
+def render_many(inputs, cfgs=None, workers=None, pool="process", **kwargs):
+    """Renders a plot for every data input in 'inputs' and saves it in the
+    output folder. The plots are drawn headless by a process or thread pool
+    with 'workers' workers (1 renders them one after another).
+
+    Args:
+        - inputs (list): Data inputs as accepted by 'KITPlot.addFiles'
+        - cfgs (None|str|list): cfg file for every input, one cfg file for
+                                all inputs or None for the default cfg names
+        - pool (str): 'process' or 'thread' pool
+        - kwargs: Options that are passed to every KITPlot instance, e.g.
+                  'cache'. The plots are always drawn headless.
+
+    Returns:
+        list: paths of the saved output files for every input in the order of
+              'inputs' (None if the plot failed)
+    """
+    if "headless" in kwargs or "cfg" in kwargs:
+        raise TypeError("render_many() sets 'headless' and 'cfg' itself, "
+                        "use 'cfgs' for the cfg files")
+    if cfgs is None or isinstance(cfgs, str):
+        cfgs = [cfgs] * len(inputs)
+    if len(cfgs) != len(inputs):
+        raise ValueError("Number of cfg files and inputs does not match")
+    start = time.perf_counter()
+    if workers == 1 or len(inputs) < 2:
+        results = [render_plot(dataInput, cfg, kwargs)
+                   for dataInput, cfg in zip(inputs, cfgs)]
+    else:
+        if pool == "process":
+            executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers)
+        with executor:
+            results = list(executor.map(
+                render_plot, inputs, cfgs, [kwargs]*len(inputs)))
+    logging.getLogger("KITPlot").info(
+        "Rendered %i plot(s) in %.3f s", len(inputs),
+        time.perf_counter() - start)
+    return results
+
+
+# single thread that writes background exports in the order they arrive
+_EXPORTER = []
+
+
+def get_exporter():
+    """Returns the thread pool that writes background exports"""
+    if not _EXPORTER:
+        _EXPORTER.append(ThreadPoolExecutor(max_workers=1))
+    return _EXPORTER[0]
+
+
+def snapshot_figure(fig):
+    """Returns an independent copy of 'fig' on an Agg canvas which is not
+    managed by pyplot, so it can be drawn by another thread while 'fig' is
+    shown.
+    """
+    manager = fig.canvas.manager
+    fig.canvas.manager = None
+    try:
+        copy = pickle.loads(pickle.dumps(fig))
+    finally:
+        fig.canvas.manager = manager
+    FigureCanvasAgg(copy)
+    return copy
+
+
+def export_figure(fig, path, formats=("png", "pdf"), dpi=100):
+    """Writes 'fig' to 'path' with the extension of every format in
+    'formats'. Every format is written by 'savefig', so the savefig
+    rcParams apply to raster and vector files alike.
+
+    Returns:
+        list: paths of the saved files
+    """
+    formats = list(OrderedDict.fromkeys(
+        fmt.strip().lstrip(".").lower() for fmt in formats if fmt.strip()))
+    written = []
+    for fmt in formats:
+        out = path + "." + fmt
+        fig.savefig(out, format=fmt, dpi=dpi)
+        written.append(out)
+    return written
+
+
 def checkPID(dataInput):
     """Checks if PIDs are listed in the file"""
     if os.path.isfile(dataInput):
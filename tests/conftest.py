@@ -0,0 +1,16 @@
+"""Makes the repository importable as the 'KITPlot' package, which is the
+folder name the framework expects (see readme), no matter how the
+repository folder is named."""
+import os
+import sys
+import importlib.util
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if "KITPlot" not in sys.modules:
+    SPEC = importlib.util.spec_from_file_location(
+        "KITPlot", os.path.join(ROOT, "__init__.py"),
+        submodule_search_locations=[ROOT])
+    MODULE = importlib.util.module_from_spec(SPEC)
+    sys.modules["KITPlot"] = MODULE
+    SPEC.loader.exec_module(MODULE)
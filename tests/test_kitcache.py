@@ -0,0 +1,98 @@
+import os
+import datetime
+from decimal import Decimal
+import numpy as np
+from KITPlot.kitcache import KITCache, KITMemo
+
+
+def measurement(n=5, **meta):
+    data = {col: np.arange(n, dtype=float) for col in KITCache.columns}
+    data["time"] = np.arange(n).astype("datetime64[s]").astype("datetime64[us]")
+    data.update(meta)
+    return data
+
+
+def test_cache_round_trip(tmp_path):
+    cache = KITCache(directory=str(tmp_path))
+    meta = {"name": "sensor", "PID": 12, "fluence": 1e15,
+            "date": datetime.datetime(2019, 5, 4, 3, 2, 1),
+            "t0": Decimal("-20.5"), "particletype": ["n", "p"]}
+    assert cache.put("new", 12, measurement(**meta)) is True
+    data = cache.get("new", 12)
+    for col in KITCache.columns:
+        np.testing.assert_array_equal(data[col], measurement()[col])
+    for key, val in meta.items():
+        assert data[key] == val
+        assert type(data[key]) is type(val)
+    assert cache.stats() == {"hits": 1, "misses": 0, "entries": 1}
+
+
+def test_cache_miss_refresh_and_ttl(tmp_path):
+    cache = KITCache(directory=str(tmp_path))
+    assert cache.get("new", 1) is None
+    cache.put("new", 1, measurement())
+    assert KITCache(directory=str(tmp_path), refresh=True).get("new", 1) \
+        is None
+    assert KITCache(directory=str(tmp_path), ttl=-1).get("new", 1) is None
+
+
+def test_cache_skips_object_columns(tmp_path):
+    cache = KITCache(directory=str(tmp_path))
+    data = measurement()
+    data["err"] = np.array([1, "a", None, 2, 3], dtype=object)
+    assert cache.put("new", 1, data) is False
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_invalidate(tmp_path):
+    cache = KITCache(directory=str(tmp_path))
+    for backend in ("new", "old"):
+        for pid in (12, 112):
+            cache.put(backend, pid, measurement())
+    cache.invalidate(pid=12)
+    assert sorted(os.listdir(str(tmp_path))) == ["new_112.npz", "old_112.npz"]
+    cache.invalidate("old")
+    assert sorted(os.listdir(str(tmp_path))) == ["new_112.npz"]
+
+
+def test_cache_eviction(tmp_path):
+    cache = KITCache(directory=str(tmp_path))
+    for pid in range(3):
+        cache.put("new", pid, measurement(1000))
+        # oldest entry first
+        path = os.path.join(str(tmp_path), "new_{}.npz".format(pid))
+        os.utime(path, (pid, pid))
+    sizes = [os.path.getsize(os.path.join(str(tmp_path), name))
+             for name in os.listdir(str(tmp_path))]
+    cache.max_size = sum(sizes) - 1
+    cache.evict()
+    assert sorted(os.listdir(str(tmp_path))) == ["new_1.npz", "new_2.npz"]
+
+
+def test_memo_round_trip():
+    memo = KITMemo()
+    data = measurement(name="sensor")
+    assert memo.put("new", 1, data) is True
+    stored = memo.get("new", 1)
+    np.testing.assert_array_equal(stored["dataX"], data["dataX"])
+    # copies are handed out
+    stored["dataX"][0] = 100
+    assert memo.get("new", 1)["dataX"][0] == 0
+    assert memo.get("old", 1) is None
+    assert memo.info()["hits"] == 2
+    assert memo.info()["misses"] == 1
+
+
+def test_memo_lru_eviction():
+    data = measurement(1000)
+    memo = KITMemo()
+    memo.put("new", 0, data)
+    size = memo.info()["size"]
+    memo.resize(2*size)
+    memo.put("new", 1, data)
+    memo.get("new", 0)
+    memo.put("new", 2, data)
+    assert memo.info()["keys"] == [("new", 0), ("new", 2)]
+    memo.resize(size)
+    assert memo.info()["keys"] == [("new", 2)]
+    assert memo.put("new", 3, measurement(100000)) is False
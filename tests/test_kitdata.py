@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from KITPlot.kitdata import KITData, read_table, iter_table
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+@pytest.mark.parametrize("text", ["1 2\n3\t4\n  5   6\n", "1,2\n3, 4\n5,6\n"])
+def test_read_table_delimiter(tmp_path, text):
+    cols, n_bad = read_table(write(tmp_path, "data.txt", text))
+    assert list(cols) == ["x", "y"]
+    np.testing.assert_array_equal(cols["x"], [1, 3, 5])
+    np.testing.assert_array_equal(cols["y"], [2, 4, 6])
+    assert cols["x"].dtype == np.float64
+    assert n_bad == 0
+
+
+def test_read_table_columns(tmp_path):
+    cols, _ = read_table(write(tmp_path, "data.txt", "1 2 3 4\n5 6 7 8\n"))
+    assert list(cols) == ["x", "y", "dx", "dy"]
+    np.testing.assert_array_equal(cols["dy"], [4, 8])
+
+
+MALFORMED = ("V I\nunit unit\n"  # header, not malformed
+             "1 2\n3 4 5\n\n  \n6 7\nab cd\n8\n1 2 3 4 5 6 7 8 9\n9 9")
+
+
+@pytest.mark.parametrize("chunksize", [None, 1, 2, 3, 100])
+def test_read_table_malformed(tmp_path, chunksize):
+    cols, n_bad = read_table(write(tmp_path, "data.txt", MALFORMED),
+                             chunksize=chunksize)
+    np.testing.assert_array_equal(cols["x"], [1, 6, 9])
+    np.testing.assert_array_equal(cols["y"], [2, 7, 9])
+    assert n_bad == 4
+
+
+def test_iter_table_chunks(tmp_path):
+    text = "".join("{} {}\n".format(i, 2*i) for i in range(10))
+    chunks = list(iter_table(write(tmp_path, "data.txt", text), chunksize=4))
+    assert [len(cols["x"]) for cols, _ in chunks] == [4, 4, 2]
+    np.testing.assert_array_equal(
+        np.concatenate([cols["y"] for cols, _ in chunks]), 2*np.arange(10))
+
+
+def test_read_table_without_data(tmp_path):
+    with pytest.raises(ValueError):
+        read_table(write(tmp_path, "empty.txt", ""))
+
+
+@pytest.mark.parametrize("text", ["", "V I\n"])
+def test_kitdata_empty_file(tmp_path, text):
+    kdata = KITData(write(tmp_path, "empty.txt", text))
+    assert kdata.getSize() == 0
+    assert kdata.getName() == "empty"
+
+
+def test_select():
+    kdata = KITData([[1, 2, 3, 4], [10, 20, 30, 40], [0, 1, 0, 1]])
+    assert kdata.select(x=(2, None), where=lambda k: k.getColumn("z") != 0) \
+        == 2
+    np.testing.assert_array_equal(kdata.getColumn("x"), [2, 4])
+    np.testing.assert_array_equal(kdata.getColumn("y"), [20, 40])
+    np.testing.assert_array_equal(kdata.getColumn("z"), [1, 1])
+
+
+def test_select_limits():
+    kdata = KITData([[1, 2, 3, 4], [10, 20, 30, 40]])
+    kdata.setRange("y", "15", 30)
+    np.testing.assert_array_equal(kdata.getColumn("x"), [2, 3])
+    with pytest.raises(ValueError):
+        kdata.select(where=[True])
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+import numpy as np
+import pytest
+from KITPlot.Utils import kitutils
+
+
+def baseline_normalize(graphs, arg):
+    """Value by value normalization as it was done before 'normalize' was
+    vectorized"""
+    graphs = [[list(col) for col in graph] for graph in graphs]
+    for i, graph in enumerate(graphs):
+        if arg in ("1/C^{2}", "CV"):
+            graph[1] = [0 if val == 0 else 1/(val*val) for val in graph[1]]
+        elif isinstance(arg, list):
+            graph[1] = [val/float(arg[i]) for val in graph[1]]
+        elif isinstance(arg, (float, int)):
+            graph[1] = [val/arg for val in graph[1]]
+        else:
+            fac = float(arg.split(" ")[1])
+            graph[0] = [val/fac for val in graph[0]]
+    return graphs
+
+
+GRAPHS = [[[1., 2., 3.], [0., 2e-10, -4e-11]],
+          [[4., 5., 6.], [1e-9, 3e-9, 0.]]]
+
+
+@pytest.mark.parametrize("args", [
+    ["CV"], [2.5], [[2, 4]], ["--x 10"], ["CV", 2.5], [2.5, "CV"],
+    ["1/C^{2}", [2, 4], "CV", "--x 10", 3]])
+def test_normalize_parity(args):
+    expected = GRAPHS
+    for arg in args:
+        expected = baseline_normalize(expected, arg)
+    result, _ = kitutils.normalize(GRAPHS, *args)
+    for graph, exp in zip(result, expected):
+        np.testing.assert_allclose(graph[0], exp[0], rtol=1e-12)
+        np.testing.assert_allclose(graph[1], exp[1], rtol=1e-12)
+
+
+def test_manipulate_options():
+    arg = OrderedDict([("a", "[2,4]"), ("b", "--x 10")])
+    result, msg = kitutils.manipulate(GRAPHS, arg, True)
+    expected = baseline_normalize(baseline_normalize(
+        baseline_normalize(GRAPHS, "CV"), [2, 4]), "--x 10")
+    np.testing.assert_allclose(result[1][1], expected[1][1], rtol=1e-12)
+    np.testing.assert_allclose(result[1][0], expected[1][0], rtol=1e-12)
+    assert msg.count(",") == 2
+
+
+def test_normalize_invalid():
+    with pytest.raises(ValueError):
+        kitutils.normalize(GRAPHS, [1, 2, 3])
+    with pytest.raises(ValueError):
+        kitutils.normalize(GRAPHS, 0)
+
+
+def test_lttb_indices():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x/50)
+    y[500] = 10
+    indices = kitutils.lttb_indices(x, y, 100)
+    assert len(indices) == 100
+    assert indices[0] == 0 and indices[-1] == 999
+    assert np.all(np.diff(indices) > 0)
+    assert 500 in indices
+    np.testing.assert_array_equal(kitutils.lttb_indices(x[:50], y[:50], 100),
+                                  np.arange(50))
+
+
+def test_minmax_indices():
+    x = np.linspace(0, 1, 10000)
+    y = np.random.default_rng(1).normal(size=x.size)
+    indices = kitutils.minmax_indices(x, y, 100)
+    assert len(indices) <= 2*100 + 2
+    assert np.all(np.diff(indices) > 0)
+    assert {0, x.size - 1, int(np.argmin(y)), int(np.argmax(y))} \
+        <= set(indices.tolist())
+    np.testing.assert_array_equal(kitutils.minmax_indices(x[:50], y[:50], 100),
+                                  np.arange(50))
+
+
+def test_minmax_indices_sweep_and_nan():
+    # up and down again with different y values on both branches
+    x = np.r_[np.linspace(0, 100, 5000), np.linspace(100, 0, 5000)]
+    y = np.r_[np.sin(x[:5000]/10), np.sin(x[5000:]/10) + 5]
+    y[10] = np.nan
+    x[20] = np.nan
+    indices = kitutils.minmax_indices(x, y, 50)
+    # both branches keep the extrema of their buckets
+    assert np.count_nonzero(indices < 5000) >= 45
+    assert np.count_nonzero(indices >= 5000) >= 45
+    assert 10 not in indices and 20 not in indices